@@ -7,48 +7,61 @@ Analyze the Greek morphological dictionary to understand how to extract
 verb conjugations for the Greek Conjugator project.
 """
 
-import sqlite3
 import os
+from collections import defaultdict
 
-def analyze_database():
+from sqlite_helpers import MORPH_DICT_URI, connect_readonly, ensure_morph_indexes
+
+def analyze_database(conn):
     """Analyze the morphological database structure and content."""
     print("🔍 Analyzing Greek Morphological Dictionary")
     print("=" * 50)
     
     try:
-        conn = sqlite3.connect('morph_dict.db')
         cursor = conn.cursor()
         
-        # Get all table names
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = cursor.fetchall()
+        # Read every table's columns in one round trip
+        cursor.execute("""
+            SELECT t.name, c.name, c.type
+            FROM sqlite_master t, pragma_table_info(t.name) c
+            WHERE t.type = 'table'
+            ORDER BY t.rowid, c.cid
+        """)
+        columns_by_table = {}
+        for table_name, column_name, column_type in cursor.fetchall():
+            columns_by_table.setdefault(table_name, []).append((column_name, column_type))
+        tables = list(columns_by_table)
         
         print(f"📋 Database contains {len(tables)} tables:")
-        for table in tables:
-            print(f"   • {table[0]}")
-        
-        # Analyze each table
-        for table_name in [t[0] for t in tables]:
+        for table_name in tables:
+            print(f"   • {table_name}")
+        
+        # Count every table's rows in one round trip
+        cursor.execute(" UNION ALL ".join(
+            f'SELECT \'{table_name}\', (SELECT COUNT(*) FROM "{table_name}")'
+            for table_name in tables
+        ))
+        row_counts = dict(cursor.fetchall())
+        
+        # Analyze each table; samples are read within one transaction
+        cursor.execute("BEGIN")
+        for table_name in tables:
             print(f"\n📊 Table: {table_name}")
             
-            # Get table structure
-            cursor.execute(f"PRAGMA table_info({table_name});")
-            columns = cursor.fetchall()
+            columns = columns_by_table[table_name]
             print(f"   Columns ({len(columns)}):")
-            for col in columns:
-                print(f"     • {col[1]} ({col[2]})")
+            for column_name, column_type in columns:
+                print(f"     • {column_name} ({column_type})")
             
-            # Get row count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
-            count = cursor.fetchone()[0]
-            print(f"   Rows: {count:,}")
+            print(f"   Rows: {row_counts[table_name]:,}")
             
             # Get sample data
-            cursor.execute(f"SELECT * FROM {table_name} LIMIT 3;")
+            cursor.execute(f'SELECT * FROM "{table_name}" LIMIT 3;')
             samples = cursor.fetchall()
             print(f"   Sample data:")
             for i, sample in enumerate(samples, 1):
                 print(f"     {i}. {sample}")
+        cursor.execute("COMMIT")
         
         # Look for verb-related data
         print(f"\n🔍 Analyzing verb data...")
@@ -77,51 +90,50 @@ def analyze_database():
         for norm_sample in norm_samples:
             print(f"   • {norm_sample}")
         
-        conn.close()
-        
     except Exception as e:
         print(f"❌ Error analyzing database: {e}")
 
-def map_our_verbs():
-    """Map our verbs to the morphological dictionary."""
+def map_our_verbs(our_conn):
+    """Map our verbs to the morphological dictionary.
+
+    our_conn must have the dictionary attached as schema ``m`` so the
+    lookup runs as one query.
+    """
     print(f"\n🔍 Mapping our verbs to morphological dictionary...")
     
     try:
-        # Connect to both databases
-        morph_conn = sqlite3.connect('morph_dict.db')
-        our_conn = sqlite3.connect('greek-conjugator/backend/greek_conjugator_dev.db')
-        
-        morph_cursor = morph_conn.cursor()
         our_cursor = our_conn.cursor()
         
-        # Get our verbs that need conjugations
+        # Get our verbs that need conjugations, with their dictionary word id
         our_cursor.execute("""
-            SELECT v.infinitive, v.english, COUNT(c.id) as conjugation_count
+            SELECT v.infinitive, v.english,
+                   (SELECT w.id FROM m.words w WHERE w.word = v.infinitive LIMIT 1) as word_id
             FROM verbs v
-            LEFT JOIN conjugations c ON v.id = c.verb_id
-            GROUP BY v.id
-            HAVING conjugation_count = 0
+            WHERE NOT EXISTS (SELECT 1 FROM conjugations c WHERE c.verb_id = v.id)
             ORDER BY v.frequency ASC
             LIMIT 20
         """)
         
         verbs_needing_conjugations = our_cursor.fetchall()
         
+        # Fetch definitions for every matched word in one query
+        word_ids = [word_id for _, _, word_id in verbs_needing_conjugations if word_id is not None]
+        definitions_by_word = defaultdict(list)
+        if word_ids:
+            placeholders = ','.join('?' * len(word_ids))
+            our_cursor.execute(f"SELECT word_id, * FROM m.def WHERE word_id IN ({placeholders});", word_ids)
+            for definition in our_cursor.fetchall():
+                definitions_by_word[definition[0]].append(definition[1:])
+        
         print(f"🔍 Checking {len(verbs_needing_conjugations)} verbs that need conjugations:")
         
         found_count = 0
-        for verb, english, count in verbs_needing_conjugations:
-            # Check if verb exists in morphological dictionary
-            morph_cursor.execute("SELECT * FROM words WHERE word = ? LIMIT 1;", (verb,))
-            result = morph_cursor.fetchone()
-            
-            if result:
+        for verb, english, word_id in verbs_needing_conjugations:
+            if word_id is not None:
                 print(f"   ✅ {verb} ({english}): Found in morphological dictionary")
                 found_count += 1
                 
-                # Get related data
-                morph_cursor.execute("SELECT * FROM def WHERE word_id = ? LIMIT 3;", (result[0],))
-                definitions = morph_cursor.fetchall()
+                definitions = definitions_by_word[word_id][:3]
                 if definitions:
                     print(f"     Definitions: {len(definitions)} found")
                 
@@ -130,16 +142,23 @@ def map_our_verbs():
         
         print(f"\n📊 Summary: Found {found_count}/{len(verbs_needing_conjugations)} verbs in morphological dictionary")
         
-        morph_conn.close()
-        our_conn.close()
-        
     except Exception as e:
         print(f"❌ Error mapping verbs: {e}")
 
 def main():
     """Main analysis function."""
-    analyze_database()
-    map_our_verbs()
+    ensure_morph_indexes()
+    
+    # Open each database once and share the connections across the analysis
+    morph_conn = connect_readonly(MORPH_DICT_URI)
+    our_conn = connect_readonly('greek-conjugator/backend/greek_conjugator_dev.db')
+    our_conn.execute("ATTACH DATABASE ? AS m", (MORPH_DICT_URI,))
+    
+    analyze_database(morph_conn)
+    map_our_verbs(our_conn)
+    
+    morph_conn.close()
+    our_conn.close()
     
     print(f"\n🎯 Next Steps:")
     print(f"1. Analyze the data structure to understand conjugation format")
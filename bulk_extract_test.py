@@ -1,107 +1,316 @@
 #!/usr/bin/env python3
-import sqlite3
+import argparse
 import json
+import os
 import re
+import shelve
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
 
+from sqlite_helpers import MORPH_DICT_PATH, MORPH_DICT_URI, connect_readonly, ensure_morph_indexes
+
+# Lemmas looked up per query; bounds how many forms are read at once
+LEMMA_BATCH_SIZE = 900
+
+# Report extraction progress once per this many lemmas
+PROGRESS_INTERVAL = 100
+
+# Worker threads used to read finite forms, each with its own connection
+EXTRACT_WORKERS = 8
+_thread_state = threading.local()
+
+# Correlated subquery serializing one lemma's finite forms to a JSON array,
+# in a stable grammatical order. json() keeps each object from being
+# re-quoted as a string when it passes through the inner SELECT.
+FINITE_FORMS_JSON_SQL = """
+    SELECT json_group_array(json(form_json)) FROM (
+        SELECT json_object(
+            'form', w.form, 'lemma', w.lemma, 'tense', w.tense, 'mood', w.mood,
+            'voice', w.voice, 'person', w.person, 'number', w.number,
+            'aspect', w.aspect, 'verbform', w.verbform, 'greek_pos', w.greek_pos
+        ) AS form_json
+        FROM m.words w
+        WHERE w.lemma = {lemma} AND w.pos = 'VERB' AND w.verbform = 'Fin'
+        ORDER BY w.tense, w.mood, w.voice, w.person, w.number
+    )
+"""
+
+# Persistent lemma -> finite forms cache, invalidated by morph_dict.db mtime
+FORMS_CACHE_PATH = 'morph_cache'
+CACHE_MTIME_KEY = '__morph_dict_mtime__'
+
+# The lemma ends at the first whitespace or opening parenthesis
+LEMMA_BOUNDARY_RE = re.compile(r'[\s(]')
+
 def extract_greek_lemma(infinitive):
     """Extract the Greek lemma from the infinitive field (before any parenthesis or explanation)."""
-    lemma = re.split(r'[\s(]', infinitive)[0]
+    lemma = LEMMA_BOUNDARY_RE.split(infinitive, maxsplit=1)[0]
     return lemma.strip()
 
-def get_app_lemmas():
-    """Get a set of unique lemmas from the app's verbs table (cleaned)."""
-    try:
-        conn = sqlite3.connect('greek-conjugator/backend/greek_conjugator_dev.db')
-        cursor = conn.cursor()
-        cursor.execute("SELECT infinitive FROM verbs")
-        infinitives = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        # Clean to get only the lemma part
-        lemmas = set(extract_greek_lemma(inf) for inf in infinitives)
-        return lemmas
-    except Exception as e:
-        print(f"❌ Error getting app lemmas: {e}")
-        return set()
+def open_connection(check_same_thread=True):
+    """Open the app database with the dictionary attached as schema ``m``.
 
-def get_dict_lemmas():
-    """Get a set of unique lemmas from the morphological dictionary."""
+    One connection serves every query on a thread so SQLite's page cache
+    is built once and reused. Not query_only: the forms lookup fills the
+    TEMP table _lookup.
+    """
+    conn = connect_readonly('greek-conjugator/backend/greek_conjugator_dev.db',
+                            query_only=False, check_same_thread=check_same_thread)
+    conn.create_function('greek_lemma', 1, extract_greek_lemma, deterministic=True)
+    conn.execute("ATTACH DATABASE ? AS m", (MORPH_DICT_URI,))
+    conn.execute("CREATE TEMP TABLE _lookup (lemma TEXT PRIMARY KEY)")
+    return conn
+
+def get_matched_lemmas(conn):
+    """Match the app's verb lemmas against the dictionary's verb lemmas in SQL.
+
+    Returns (app_lemma_count, dict_lemma_count, matched_lemmas), with the
+    matched lemmas sorted. The intersection runs inside SQLite rather than
+    over Python sets.
+    """
     try:
-        conn = sqlite3.connect('morph_dict.db')
         cursor = conn.cursor()
-        cursor.execute("SELECT DISTINCT lemma FROM words WHERE pos = 'VERB'")
-        dict_lemmas = set(row[0] for row in cursor.fetchall())
-        conn.close()
-        return dict_lemmas
+        cursor.execute("""
+            SELECT (SELECT COUNT(DISTINCT greek_lemma(infinitive)) FROM verbs),
+                   (SELECT COUNT(DISTINCT lemma) FROM m.words WHERE pos = 'VERB')
+        """)
+        app_count, dict_count = cursor.fetchone()
+        cursor.execute("""
+            SELECT greek_lemma(infinitive) FROM verbs
+            INTERSECT
+            SELECT lemma FROM m.words WHERE pos = 'VERB'
+            ORDER BY 1
+        """)
+        matched_lemmas = [row[0] for row in cursor.fetchall()]
+        return app_count, dict_count, matched_lemmas
     except Exception as e:
-        print(f"❌ Error getting dictionary lemmas: {e}")
-        return set()
+        print(f"❌ Error matching lemmas: {e}")
+        return 0, 0, []
+
+def open_forms_cache():
+    """Open the on-disk lemma -> (finite_forms_count, finite_forms JSON) cache.
+
+    The cache is tied to the morph_dict.db modification time and is cleared
+    whenever the dictionary is rebuilt.
+    """
+    cache = shelve.open(FORMS_CACHE_PATH)
+    dict_mtime = os.path.getmtime(MORPH_DICT_PATH)
+    if cache.get(CACHE_MTIME_KEY) != dict_mtime:
+        cache.clear()
+        cache[CACHE_MTIME_KEY] = dict_mtime
+    return cache
+
+@lru_cache(maxsize=None)
+def _load_finite_forms(lemma):
+    with open_forms_cache() as cache:
+        if lemma not in cache:
+            conn = open_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT json_array_length(forms), forms
+                FROM (SELECT ({FINITE_FORMS_JSON_SQL.format(lemma='?')}) AS forms)
+            """, (lemma,))
+            cache[lemma] = cursor.fetchone()
+            conn.close()
+        _, forms_json = cache[lemma]
+        return json.loads(forms_json)
 
 def extract_finite_forms(lemma):
-    """Extract all finite forms for a given lemma from morphological dictionary"""
+    """Extract all finite forms for a given lemma from morphological dictionary (memoized)"""
     try:
-        conn = sqlite3.connect('morph_dict.db')
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT form, lemma, tense, mood, voice, person, number, aspect, verbform, greek_pos
-            FROM words 
-            WHERE lemma = ? AND pos = 'VERB' AND verbform = 'Fin'
-            ORDER BY tense, mood, voice, person, number
-        """, (lemma,))
-        conjugations = cursor.fetchall()
-        conn.close()
-        forms = []
-        for conj in conjugations:
-            form, lemma, tense, mood, voice, person, number, aspect, verbform, greek_pos = conj
-            forms.append({
-                'form': form,
-                'lemma': lemma,
-                'tense': tense,
-                'mood': mood,
-                'voice': voice,
-                'person': person,
-                'number': number,
-                'aspect': aspect,
-                'verbform': verbform,
-                'greek_pos': greek_pos
-            })
-        return forms
+        return _load_finite_forms(lemma)
     except Exception as e:
         print(f"❌ Error extracting forms for {lemma}: {e}")
         return []
 
-def bulk_extract_matched_lemmas():
+def load_lookup(conn, lemmas):
+    """Replace the contents of the TEMP _lookup table with the given lemmas."""
+    with conn:
+        conn.execute("DELETE FROM _lookup")
+        conn.executemany("INSERT INTO _lookup VALUES (?)", [(lemma,) for lemma in lemmas])
+
+def iter_finite_forms(conn, lemmas):
+    """Yield (lemma, finite_forms_count, finite_forms JSON) for each of the sorted lemmas, in order.
+
+    Each batch of LEMMA_BATCH_SIZE lemmas is loaded into the TEMP table
+    _lookup and every lemma's forms are serialized to a JSON array inside
+    SQLite, so no per-form Python objects are created. Every batch runs the
+    same cached statement whatever its size.
+    """
+    cursor = conn.cursor()
+    for start in range(0, len(lemmas), LEMMA_BATCH_SIZE):
+        batch = lemmas[start:start + LEMMA_BATCH_SIZE]
+        load_lookup(conn, batch)
+        cursor.execute(f"""
+            SELECT lemma, json_array_length(forms), forms
+            FROM (
+                SELECT l.lemma, ({FINITE_FORMS_JSON_SQL.format(lemma='l.lemma')}) AS forms
+                FROM _lookup l
+            )
+            ORDER BY lemma
+        """)
+        yield from cursor
+
+def _thread_connection(opened):
+    """Return this worker thread's connection, opening it on first use."""
+    conn = getattr(_thread_state, 'conn', None)
+    if conn is None:
+        # Closed from the main thread once the pool shuts down
+        conn = open_connection(check_same_thread=False)
+        _thread_state.conn = conn
+        opened.append(conn)
+    return conn
+
+def extract_one(conn, lemma):
+    """Return (lemma, finite_forms_count, finite_forms JSON) for one lemma, with no JSON on error."""
+    try:
+        return next(iter_finite_forms(conn, [lemma]))
+    except Exception as e:
+        print(f"❌ Error extracting forms for {lemma}: {e}")
+        return lemma, 0, None
+
+def iter_finite_forms_parallel(lemmas, max_workers=EXTRACT_WORKERS):
+    """Yield (lemma, finite_forms_count, finite_forms JSON) like iter_finite_forms, reading on a thread pool.
+
+    The sqlite3 module releases the GIL while SQLite runs a query, so batches
+    are read concurrently, each worker on its own connection. Results are
+    yielded in input order and at most 2 * max_workers batches are in flight.
+    """
+    batch_size = max(1, min(LEMMA_BATCH_SIZE, -(-len(lemmas) // max_workers)))
+    opened = []
+    
+    def extract_batch(batch):
+        conn = _thread_connection(opened)
+        try:
+            return list(iter_finite_forms(conn, batch))
+        except Exception:
+            # Retry lemma by lemma so one bad lemma doesn't sink its batch
+            return [extract_one(conn, lemma) for lemma in batch]
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight = deque()
+            for start in range(0, len(lemmas), batch_size):
+                in_flight.append(executor.submit(extract_batch, lemmas[start:start + batch_size]))
+                if len(in_flight) >= 2 * max_workers:
+                    yield from in_flight.popleft().result()
+            while in_flight:
+                yield from in_flight.popleft().result()
+    finally:
+        for conn in opened:
+            conn.close()
+
+def count_finite_forms(conn, lemmas):
+    """Yield (lemma, finite_forms_count) for each of the sorted lemmas, in order.
+
+    Counts are aggregated in SQL, so no per-form rows reach Python.
+    """
+    cursor = conn.cursor()
+    for start in range(0, len(lemmas), LEMMA_BATCH_SIZE):
+        batch = lemmas[start:start + LEMMA_BATCH_SIZE]
+        load_lookup(conn, batch)
+        cursor.execute("""
+            SELECT l.lemma, COUNT(w.lemma)
+            FROM _lookup l
+            LEFT JOIN m.words w ON w.lemma = l.lemma AND w.pos = 'VERB' AND w.verbform = 'Fin'
+            GROUP BY l.lemma
+            ORDER BY l.lemma
+        """)
+        yield from cursor
+
+def summarize_matched_lemmas(conn, matched_lemmas):
+    """Write only per-lemma finite form counts, skipping the forms themselves."""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"morph_extraction_summary_{timestamp}.json"
+    summary = [
+        {'lemma': lemma, 'finite_forms_count': count}
+        for lemma, count in count_finite_forms(conn, matched_lemmas)
+    ]
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    total_forms = sum(r['finite_forms_count'] for r in summary)
+    print(f"\n📊 Extraction Summary:")
+    print(f"   Total matched lemmas: {len(matched_lemmas)}")
+    print(f"   Total finite forms available: {total_forms}")
+    avg_forms = total_forms / len(matched_lemmas) if matched_lemmas else 0
+    print(f"   Average forms per lemma: {avg_forms:.1f}")
+    print(f"\n💾 Counts exported to: {filename}")
+
+def bulk_extract_matched_lemmas(summary_only=False):
     print("🚀 Bulk Extraction - App Lemmas Matched to Dictionary")
     print("=" * 60)
-    app_lemmas = get_app_lemmas()
-    print(f"📋 App verb lemmas: {len(app_lemmas)}")
-    dict_lemmas = get_dict_lemmas()
-    print(f"📋 Dictionary verb lemmas: {len(dict_lemmas)}")
-    matched_lemmas = sorted(app_lemmas & dict_lemmas)
+    ensure_morph_indexes()
+    conn = open_connection()
+    app_count, dict_count, matched_lemmas = get_matched_lemmas(conn)
+    print(f"📋 App verb lemmas: {app_count}")
+    print(f"📋 Dictionary verb lemmas: {dict_count}")
     print(f"✅ Matched lemmas: {len(matched_lemmas)}")
-    extraction_results = []
-    for i, lemma in enumerate(matched_lemmas, 1):
-        print(f"\n🔍 [{i}/{len(matched_lemmas)}] Extracting: {lemma}")
-        finite_forms = extract_finite_forms(lemma)
-        extraction_results.append({
-            'lemma': lemma,
-            'finite_forms_count': len(finite_forms),
-            'finite_forms': finite_forms
-        })
-        print(f"   ✅ Found {len(finite_forms)} finite forms")
+    if summary_only:
+        summarize_matched_lemmas(conn, matched_lemmas)
+        conn.close()
+        return
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"morph_extraction_matched_{timestamp}.json"
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(extraction_results, f, ensure_ascii=False, indent=2)
+    # Write each lemma's result as soon as it is extracted instead of
+    # collecting every form before a single json.dump
+    total_forms = 0
+    failed_lemmas = 0
+    sample_results = []
+    with open(filename, 'w', encoding='utf-8') as f, open_forms_cache() as cache:
+        f.write('[')
+        # Only lemmas missing from the on-disk cache hit the dictionary
+        uncached = [lemma for lemma in matched_lemmas if lemma not in cache]
+        uncached_set = set(uncached)
+        fresh_forms = iter_finite_forms_parallel(uncached)
+        for i, lemma in enumerate(matched_lemmas, 1):
+            try:
+                if lemma in uncached_set:
+                    _, forms_count, forms_json = next(fresh_forms)
+                    if forms_json is not None:
+                        try:
+                            cache[lemma] = (forms_count, forms_json)
+                        except Exception as e:
+                            print(f"⚠️  Could not cache forms for {lemma}: {e}")
+                else:
+                    forms_count, forms_json = cache[lemma]
+            except Exception as e:
+                print(f"❌ Error extracting forms for {lemma}: {e}")
+                forms_json = None
+            if forms_json is None:
+                # Already reported; export the lemma with no forms and carry on
+                forms_count, forms_json = 0, '[]'
+                failed_lemmas += 1
+            # The forms arrive already serialized; splice them in as-is
+            if i > 1:
+                f.write(',')
+            f.write(
+                f'\n{{"lemma": {json.dumps(lemma, ensure_ascii=False)}, '
+                f'"finite_forms_count": {forms_count}, "finite_forms": {forms_json}}}'
+            )
+            total_forms += forms_count
+            if len(sample_results) < 3:
+                sample_results.append({
+                    'lemma': lemma,
+                    'finite_forms_count': forms_count,
+                    'finite_forms': json.loads(forms_json)[:3]
+                })
+            if i % PROGRESS_INTERVAL == 0 or i == len(matched_lemmas):
+                print(f"🔍 [{i}/{len(matched_lemmas)}] Extracted {total_forms} finite forms so far")
+        f.write('\n]')
+    conn.close()
     print(f"\n�� Extraction Summary:")
     print(f"   Total matched lemmas: {len(matched_lemmas)}")
-    total_forms = sum(r['finite_forms_count'] for r in extraction_results)
     print(f"   Total finite forms extracted: {total_forms}")
-    avg_forms = total_forms / len(extraction_results) if extraction_results else 0
+    if failed_lemmas:
+        print(f"   Lemmas that failed (exported with no forms): {failed_lemmas}")
+    avg_forms = total_forms / len(matched_lemmas) if matched_lemmas else 0
     print(f"   Average forms per lemma: {avg_forms:.1f}")
     print(f"\n💾 Results exported to: {filename}")
     print(f"\n📝 Sample extraction results:")
-    for i, result in enumerate(extraction_results[:3], 1):
+    for i, result in enumerate(sample_results, 1):
         print(f"   {i}. {result['lemma']}: {result['finite_forms_count']} forms")
         if result['finite_forms']:
             sample_forms = result['finite_forms'][:3]
@@ -109,4 +318,7 @@ def bulk_extract_matched_lemmas():
                 print(f"      - {form['form']} ({form['tense']} {form['mood']} {form['voice']} {form['person']} {form['number']})")
 
 if __name__ == "__main__":
-    bulk_extract_matched_lemmas() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Extract finite verb forms for app lemmas from the morphological dictionary')
+    parser.add_argument('--summary-only', action='store_true', help='Only export per-lemma form counts')
+    args = parser.parse_args()
+    bulk_extract_matched_lemmas(summary_only=args.summary_only)
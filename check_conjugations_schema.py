@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
-import sqlite3
+from sqlite_helpers import connect_readonly
 
 def check_schema():
     try:
-        conn = sqlite3.connect('greek-conjugator/backend/greek_conjugator_dev.db')
+        conn = connect_readonly('greek-conjugator/backend/greek_conjugator_dev.db')
         cursor = conn.cursor()
         
         # Get conjugations table schema
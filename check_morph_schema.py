@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import sqlite3
+from sqlite_helpers import MORPH_DICT_URI, connect_readonly
 
 def check_schema():
     print("🔍 Checking Morphological Dictionary Schema")
@@ -7,7 +7,7 @@ def check_schema():
     
     try:
         # Connect to morphological dictionary
-        conn = sqlite3.connect('morph_dict.db')
+        conn = connect_readonly(MORPH_DICT_URI)
         cursor = conn.cursor()
         
         # Get table schema
@@ -27,24 +27,26 @@ def check_schema():
             for i, col in enumerate(columns):
                 print(f"   {col[1]}: {sample[i]}")
         
-        # Check what fields are actually populated
+        # Check what fields are actually populated, in one round trip
         cursor.execute("""
-            SELECT DISTINCT tense FROM words WHERE pos = 'VERB' AND tense IS NOT NULL LIMIT 10;
+            SELECT 'tense', tense FROM (
+                SELECT DISTINCT tense FROM words WHERE pos = 'VERB' AND tense IS NOT NULL LIMIT 10
+            )
+            UNION ALL
+            SELECT 'mood', mood FROM (
+                SELECT DISTINCT mood FROM words WHERE pos = 'VERB' AND mood IS NOT NULL LIMIT 10
+            )
+            UNION ALL
+            SELECT 'voice', voice FROM (
+                SELECT DISTINCT voice FROM words WHERE pos = 'VERB' AND voice IS NOT NULL LIMIT 10
+            );
         """)
-        tenses = cursor.fetchall()
-        print(f"\n📊 Sample tenses: {[t[0] for t in tenses]}")
-        
-        cursor.execute("""
-            SELECT DISTINCT mood FROM words WHERE pos = 'VERB' AND mood IS NOT NULL LIMIT 10;
-        """)
-        moods = cursor.fetchall()
-        print(f"📊 Sample moods: {[m[0] for m in moods]}")
-        
-        cursor.execute("""
-            SELECT DISTINCT voice FROM words WHERE pos = 'VERB' AND voice IS NOT NULL LIMIT 10;
-        """)
-        voices = cursor.fetchall()
-        print(f"📊 Sample voices: {[v[0] for v in voices]}")
+        samples = {'tense': [], 'mood': [], 'voice': []}
+        for field, value in cursor.fetchall():
+            samples[field].append(value)
+        print(f"\n📊 Sample tenses: {samples['tense']}")
+        print(f"📊 Sample moods: {samples['mood']}")
+        print(f"📊 Sample voices: {samples['voice']}")
         
         conn.close()
         
@@ -1,141 +1,215 @@
 #!/usr/bin/env python3
-import sqlite3
+import random
 import re
+from collections import defaultdict
 from datetime import datetime
 
+from sqlite_helpers import connect_readonly
+
+# Allowed values for the grammatical columns of conjugations
+VALID_VALUES = {
+    'tense': ('present', 'imperfect', 'future', 'perfect', 'aorist'),
+    'mood': ('indicative', 'imperative', 'subjunctive'),
+    'voice': ('active', 'passive'),
+}
+
+# Random conjugations shown in the quality check, and how many candidate
+# rowids are drawn per sample
+SAMPLE_SIZE = 10
+SAMPLE_OVERDRAW = 3
+
+# Tags of single-value rows in the combined statistics query
+SCALAR_TAGS = {
+    'total_verbs', 'total_conjugations', 'verbs_with_conjugations',
+    'empty_forms', 'orphaned_conjugations', 'duplicates',
+}
+
+def sample_random_conjugations(cursor, sample_size):
+    """Pick random conjugations by rowid instead of sorting the table by RANDOM().
+
+    Candidate rowids are drawn in Python (oversampled to allow for gaps left
+    by deleted rows) and fetched with a single rowid lookup.
+    """
+    cursor.execute("SELECT MIN(rowid), MAX(rowid) FROM conjugations")
+    min_rowid, max_rowid = cursor.fetchone()
+    if min_rowid is None:
+        return []
+    rowid_range = range(min_rowid, max_rowid + 1)
+    candidates = random.sample(rowid_range, min(len(rowid_range), sample_size * SAMPLE_OVERDRAW))
+    placeholders = ','.join('?' * len(candidates))
+    cursor.execute(f"""
+        SELECT v.infinitive, c.tense, c.mood, c.voice, c.person, c.number, c.form
+        FROM conjugations c
+        JOIN verbs v ON v.id = c.verb_id
+        WHERE c.rowid IN ({placeholders})
+    """, candidates)
+    rows = cursor.fetchall()
+    random.shuffle(rows)
+    return rows[:sample_size]
+
 def validate_database_integrity():
     """Comprehensive validation of the database"""
     print("🔍 Comprehensive Data Validation")
     print("=" * 50)
     
     try:
-        conn = sqlite3.connect('greek-conjugator/backend/greek_conjugator_dev.db')
+        # Not query_only: the consistency checks below build TEMP lookup tables
+        conn = connect_readonly('greek-conjugator/backend/greek_conjugator_dev.db', query_only=False)
         cursor = conn.cursor()
         
+        # Lookup tables for the consistency checks, so invalid values are
+        # found with an anti-join instead of a NOT IN scan
+        for column, values in VALID_VALUES.items():
+            cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS valid_{column} (v TEXT PRIMARY KEY)")
+            cursor.executemany(f"INSERT OR IGNORE INTO valid_{column} VALUES (?)", [(v,) for v in values])
+        
+        # Gather every statistic in one round trip; each row is tagged with
+        # the report section it belongs to as (tag, key, value)
+        cursor.execute("""
+            WITH coverage AS (
+                -- COUNT(*) over the model's ix_conj_verb_tmv index (verb_id first)
+                -- never touches conjugation rows
+                SELECT v.id, v.infinitive,
+                       (SELECT COUNT(*) FROM conjugations c WHERE c.verb_id = v.id) as conjugation_count
+                FROM verbs v
+            ),
+            -- Size, empty-form and orphan checks share one scan of conjugations;
+            -- SQLite materializes this CTE since it is referenced three times
+            quality AS (
+                SELECT COUNT(*) as total_conjugations,
+                       SUM(CASE WHEN c.form IS NULL OR c.form = '' THEN 1 ELSE 0 END) as empty_forms,
+                       SUM(CASE WHEN v.id IS NULL THEN 1 ELSE 0 END) as orphaned_conjugations
+                FROM conjugations c
+                LEFT JOIN verbs v ON c.verb_id = v.id
+            )
+            SELECT 'total_verbs', NULL, COUNT(*) FROM coverage
+            UNION ALL
+            SELECT 'total_conjugations', NULL, total_conjugations FROM quality
+            UNION ALL
+            SELECT 'verbs_with_conjugations', NULL, COUNT(*) FROM coverage WHERE conjugation_count > 0
+            UNION ALL
+            SELECT 'empty_forms', NULL, COALESCE(empty_forms, 0) FROM quality
+            UNION ALL
+            SELECT 'orphaned_conjugations', NULL, COALESCE(orphaned_conjugations, 0) FROM quality
+            UNION ALL
+            SELECT 'duplicates', NULL, COUNT(*) FROM (
+                SELECT 1 FROM conjugations
+                GROUP BY verb_id, tense, mood, voice, person, number, form
+                HAVING COUNT(*) > 1
+            )
+            UNION ALL
+            SELECT 'tense_dist', tense, COUNT(*) FROM conjugations GROUP BY tense
+            UNION ALL
+            SELECT 'mood_dist', mood, COUNT(*) FROM conjugations GROUP BY mood
+            UNION ALL
+            SELECT 'voice_dist', voice, COUNT(*) FROM conjugations GROUP BY voice
+            UNION ALL
+            SELECT 'coverage', coverage_level, COUNT(*) FROM (
+                SELECT CASE 
+                    WHEN conjugation_count >= 100 THEN 'Excellent (100+)'
+                    WHEN conjugation_count >= 50 THEN 'Good (50-99)'
+                    WHEN conjugation_count >= 20 THEN 'Fair (20-49)'
+                    ELSE 'Poor (<20)'
+                END as coverage_level
+                FROM coverage
+            )
+            GROUP BY coverage_level
+            UNION ALL
+            SELECT 'top_verbs', infinitive, conjugation_count FROM (
+                SELECT infinitive, conjugation_count FROM coverage
+                WHERE conjugation_count > 0
+                ORDER BY conjugation_count DESC
+                LIMIT 5
+            )
+            UNION ALL
+            SELECT 'invalid_tenses', tense, NULL FROM (
+                SELECT DISTINCT c.tense FROM conjugations c
+                LEFT JOIN valid_tense vv ON c.tense = vv.v
+                WHERE vv.v IS NULL AND c.tense IS NOT NULL
+            )
+            UNION ALL
+            SELECT 'invalid_moods', mood, NULL FROM (
+                SELECT DISTINCT c.mood FROM conjugations c
+                LEFT JOIN valid_mood vv ON c.mood = vv.v
+                WHERE vv.v IS NULL AND c.mood IS NOT NULL
+            )
+            UNION ALL
+            SELECT 'invalid_voices', voice, NULL FROM (
+                SELECT DISTINCT c.voice FROM conjugations c
+                LEFT JOIN valid_voice vv ON c.voice = vv.v
+                WHERE vv.v IS NULL AND c.voice IS NOT NULL
+            )
+        """)
+        totals = {}
+        rows_by_tag = defaultdict(list)
+        for tag, key, value in cursor.fetchall():
+            if tag in SCALAR_TAGS:
+                totals[tag] = value
+            else:
+                rows_by_tag[tag].append((key, value))
+        for tag in ('tense_dist', 'mood_dist', 'voice_dist', 'coverage', 'top_verbs'):
+            rows_by_tag[tag].sort(key=lambda row: row[1], reverse=True)
+        
         # 1. Basic Statistics
         print("\n📊 BASIC STATISTICS:")
         print("-" * 30)
         
-        cursor.execute("SELECT COUNT(*) FROM verbs")
-        total_verbs = cursor.fetchone()[0]
+        total_verbs = totals['total_verbs']
         print(f"Total verbs: {total_verbs}")
         
-        cursor.execute("SELECT COUNT(*) FROM conjugations")
-        total_conjugations = cursor.fetchone()[0]
+        total_conjugations = totals['total_conjugations']
         print(f"Total conjugations: {total_conjugations}")
         
-        cursor.execute("""
-            SELECT COUNT(DISTINCT v.id) 
-            FROM verbs v 
-            JOIN conjugations c ON v.id = c.verb_id
-        """)
-        verbs_with_conjugations = cursor.fetchone()[0]
+        verbs_with_conjugations = totals['verbs_with_conjugations']
         print(f"Verbs with conjugations: {verbs_with_conjugations}")
         
         # 2. Data Quality Checks
         print("\n🔍 DATA QUALITY CHECKS:")
         print("-" * 30)
         
-        # Check for empty forms
-        cursor.execute("SELECT COUNT(*) FROM conjugations WHERE form IS NULL OR form = ''")
-        empty_forms = cursor.fetchone()[0]
+        empty_forms = totals['empty_forms']
         print(f"Empty forms: {empty_forms}")
         
-        # Check for orphaned conjugations
-        cursor.execute("""
-            SELECT COUNT(*) FROM conjugations c 
-            LEFT JOIN verbs v ON c.verb_id = v.id 
-            WHERE v.id IS NULL
-        """)
-        orphaned_conjugations = cursor.fetchone()[0]
+        orphaned_conjugations = totals['orphaned_conjugations']
         print(f"Orphaned conjugations: {orphaned_conjugations}")
         
-        # Check for duplicate conjugations
-        cursor.execute("""
-            SELECT verb_id, tense, mood, voice, person, number, form, COUNT(*)
-            FROM conjugations 
-            GROUP BY verb_id, tense, mood, voice, person, number, form
-            HAVING COUNT(*) > 1
-        """)
-        duplicates = cursor.fetchall()
-        print(f"Duplicate conjugations: {len(duplicates)}")
+        duplicate_count = totals['duplicates']
+        print(f"Duplicate conjugations: {duplicate_count}")
         
         # 3. Tense/Mood/Voice Distribution
         print("\n📊 GRAMMATICAL DISTRIBUTION:")
         print("-" * 30)
         
-        cursor.execute("SELECT tense, COUNT(*) FROM conjugations GROUP BY tense ORDER BY COUNT(*) DESC")
-        tense_dist = cursor.fetchall()
         print("Tense distribution:")
-        for tense, count in tense_dist:
+        for tense, count in rows_by_tag['tense_dist']:
             print(f"  {tense}: {count}")
         
-        cursor.execute("SELECT mood, COUNT(*) FROM conjugations GROUP BY mood ORDER BY COUNT(*) DESC")
-        mood_dist = cursor.fetchall()
         print("Mood distribution:")
-        for mood, count in mood_dist:
+        for mood, count in rows_by_tag['mood_dist']:
             print(f"  {mood}: {count}")
         
-        cursor.execute("SELECT voice, COUNT(*) FROM conjugations GROUP BY voice ORDER BY COUNT(*) DESC")
-        voice_dist = cursor.fetchall()
         print("Voice distribution:")
-        for voice, count in voice_dist:
+        for voice, count in rows_by_tag['voice_dist']:
             print(f"  {voice}: {count}")
         
         # 4. Verb Coverage Analysis
         print("\n📊 VERB COVERAGE ANALYSIS:")
         print("-" * 30)
         
-        cursor.execute("""
-            SELECT 
-                CASE 
-                    WHEN conjugation_count >= 100 THEN 'Excellent (100+)'
-                    WHEN conjugation_count >= 50 THEN 'Good (50-99)'
-                    WHEN conjugation_count >= 20 THEN 'Fair (20-49)'
-                    ELSE 'Poor (<20)'
-                END as coverage_level,
-                COUNT(*) as verb_count
-            FROM (
-                SELECT v.infinitive, COUNT(c.id) as conjugation_count
-                FROM verbs v 
-                LEFT JOIN conjugations c ON v.id = c.verb_id
-                GROUP BY v.id, v.infinitive
-            )
-            GROUP BY coverage_level
-            ORDER BY verb_count DESC
-        """)
-        coverage_analysis = cursor.fetchall()
         print("Verb coverage levels:")
-        for level, count in coverage_analysis:
+        for level, count in rows_by_tag['coverage']:
             print(f"  {level}: {count} verbs")
         
         # 5. Sample Quality Check
         print("\n📝 SAMPLE QUALITY CHECK:")
         print("-" * 30)
         
-        # Sample verbs with high conjugation counts
-        cursor.execute("""
-            SELECT v.infinitive, COUNT(c.id) as conjugation_count
-            FROM verbs v 
-            JOIN conjugations c ON v.id = c.verb_id
-            GROUP BY v.id, v.infinitive
-            ORDER BY conjugation_count DESC
-            LIMIT 5
-        """)
-        top_verbs = cursor.fetchall()
         print("Top 5 verbs by conjugation count:")
-        for verb, count in top_verbs:
+        for verb, count in rows_by_tag['top_verbs']:
             print(f"  {verb}: {count} conjugations")
         
         # Sample conjugations for quality check
-        cursor.execute("""
-            SELECT v.infinitive, c.tense, c.mood, c.voice, c.person, c.number, c.form
-            FROM verbs v 
-            JOIN conjugations c ON v.id = c.verb_id
-            ORDER BY RANDOM()
-            LIMIT 10
-        """)
-        sample_conjugations = cursor.fetchall()
+        sample_conjugations = sample_random_conjugations(cursor, SAMPLE_SIZE)
         print("\nSample conjugations (random):")
         for row in sample_conjugations:
             infinitive, tense, mood, voice, person, number, form = row
@@ -145,23 +219,17 @@ def validate_database_integrity():
         print("\n🔍 DATA CONSISTENCY CHECKS:")
         print("-" * 30)
         
-        # Check for invalid tense values
-        cursor.execute("SELECT DISTINCT tense FROM conjugations WHERE tense NOT IN ('present', 'imperfect', 'future', 'perfect', 'aorist')")
-        invalid_tenses = cursor.fetchall()
+        invalid_tenses = rows_by_tag['invalid_tenses']
         print(f"Invalid tense values: {len(invalid_tenses)}")
         if invalid_tenses:
             print(f"  Found: {[t[0] for t in invalid_tenses]}")
         
-        # Check for invalid mood values
-        cursor.execute("SELECT DISTINCT mood FROM conjugations WHERE mood NOT IN ('indicative', 'imperative', 'subjunctive')")
-        invalid_moods = cursor.fetchall()
+        invalid_moods = rows_by_tag['invalid_moods']
         print(f"Invalid mood values: {len(invalid_moods)}")
         if invalid_moods:
             print(f"  Found: {[m[0] for m in invalid_moods]}")
         
-        # Check for invalid voice values
-        cursor.execute("SELECT DISTINCT voice FROM conjugations WHERE voice NOT IN ('active', 'passive')")
-        invalid_voices = cursor.fetchall()
+        invalid_voices = rows_by_tag['invalid_voices']
         print(f"Invalid voice values: {len(invalid_voices)}")
         if invalid_voices:
             print(f"  Found: {[v[0] for v in invalid_voices]}")
@@ -185,8 +253,8 @@ def validate_database_integrity():
             issues.append(f"Empty forms: {empty_forms}")
         if orphaned_conjugations > 0:
             issues.append(f"Orphaned conjugations: {orphaned_conjugations}")
-        if len(duplicates) > 0:
-            issues.append(f"Duplicate conjugations: {len(duplicates)}")
+        if duplicate_count > 0:
+            issues.append(f"Duplicate conjugations: {duplicate_count}")
         if len(invalid_tenses) > 0:
             issues.append(f"Invalid tenses: {len(invalid_tenses)}")
         if len(invalid_moods) > 0:
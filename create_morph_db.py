@@ -6,29 +6,60 @@ Create Morphological Database
 Create and explore the Greek morphological dictionary database.
 """
 
-import subprocess
 import sqlite3
 import os
 
+def reverse_text(text):
+    """Reverse a string for the ending index (NULL-safe)."""
+    return text[::-1] if text is not None else None
+
 def create_database():
     """Create the morphological database."""
     print("🔧 Creating morphological database...")
     
     try:
-        # Create database from SQL file
-        result = subprocess.run([
-            'sqlite3', 'morph_dict.db', '<', 'morph-dict-v0.2/dict.sql'
-        ], shell=True, capture_output=True, text=True)
+        with open('morph-dict-v0.2/dict.sql', 'r', encoding='utf-8') as f:
+            sql = f.read()
         
-        if result.returncode == 0:
-            print("✅ Database created successfully!")
-            return True
-        else:
-            print(f"❌ Error creating database: {result.stderr}")
-            return False
+        # Load the whole dump in one transaction unless it manages its own
+        if 'BEGIN TRANSACTION' not in sql:
+            sql = f"BEGIN;\n{sql}\nCOMMIT;"
+        
+        conn = sqlite3.connect('morph_dict.db')
+        # One-shot bulk load: no rollback journal, fsyncs or shared locking
+        conn.executescript("""
+            PRAGMA journal_mode=OFF;
+            PRAGMA synchronous=OFF;
+            PRAGMA locking_mode=EXCLUSIVE;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-262144;
+        """)
+        conn.create_function('reverse', 1, reverse_text, deterministic=True)
+        try:
+            conn.executescript(sql)
+            # Verb lookups filter on pos/verbform and group by lemma
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_words_verb ON words(pos, verbform, lemma)")
+            # Each word stored reversed, so "ends with" searches become
+            # indexed prefix searches on rword
+            conn.execute("ALTER TABLE words ADD COLUMN rword TEXT")
+            conn.execute("UPDATE words SET rword = reverse(word)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_words_rword ON words(rword)")
+            # The word count never changes after the load, so it is kept
+            # rather than recounted on every explore
+            conn.execute("CREATE TABLE word_stats AS SELECT COUNT(*) AS total FROM words")
+            conn.execute("ANALYZE")
+            conn.commit()
+        finally:
+            conn.close()
+        
+        print("✅ Database created successfully!")
+        return True
             
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"❌ Error creating database: {e}")
+        # Don't leave a half-loaded database behind for the next run to reuse
+        if os.path.exists('morph_dict.db'):
+            os.remove('morph_dict.db')
         return False
 
 def explore_database():
@@ -39,20 +70,30 @@ def explore_database():
         conn = sqlite3.connect('morph_dict.db')
         cursor = conn.cursor()
         
-        # Get table names
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = cursor.fetchall()
+        # Table names and the words table's columns in one round trip
+        cursor.execute("""
+            SELECT m.name, c.name, c.type
+            FROM sqlite_master m
+            LEFT JOIN pragma_table_info(m.name) c ON m.name = 'words'
+            WHERE m.type = 'table'
+            ORDER BY m.rowid, c.cid
+        """)
+        tables = []
+        columns = []
+        for table, col_name, col_type in cursor:
+            if table not in tables:
+                tables.append(table)
+            if col_name is not None:
+                columns.append((col_name, col_type))
         
         print(f"📋 Found {len(tables)} tables:")
         for table in tables:
-            print(f"   • {table[0]}")
+            print(f"   • {table}")
         
         # Explore words table
         print("\n📊 Words table structure:")
-        cursor.execute("PRAGMA table_info(words);")
-        columns = cursor.fetchall()
-        for col in columns:
-            print(f"   • {col[1]} ({col[2]})")
+        for col_name, col_type in columns:
+            print(f"   • {col_name} ({col_type})")
         
         # Get sample data
         print("\n📝 Sample words:")
@@ -61,14 +102,21 @@ def explore_database():
         for sample in samples:
             print(f"   • {sample}")
         
-        # Count total words
-        cursor.execute("SELECT COUNT(*) FROM words;")
+        # Count total words, from word_stats when the database has it
+        if 'word_stats' in tables:
+            cursor.execute("SELECT total FROM word_stats;")
+        else:
+            cursor.execute("SELECT COUNT(*) FROM words;")
         total = cursor.fetchone()[0]
         print(f"\n📊 Total words: {total:,}")
         
-        # Look for verbs
+        # Look for verbs; with the reversed-word column this is an indexed
+        # prefix search (GLOB, since LIKE would not use the index)
         print("\n🔍 Looking for verbs ending in -ω:")
-        cursor.execute("SELECT word FROM words WHERE word LIKE '%ω' LIMIT 10;")
+        if any(col_name == 'rword' for col_name, _ in columns):
+            cursor.execute("SELECT word FROM words WHERE rword GLOB 'ω*' LIMIT 10;")
+        else:
+            cursor.execute("SELECT word FROM words WHERE word LIKE '%ω' LIMIT 10;")
         verbs = cursor.fetchall()
         for verb in verbs:
             print(f"   • {verb[0]}")
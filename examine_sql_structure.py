@@ -6,26 +6,64 @@ Examine SQL Structure
 Quick examination of the morphological dictionary SQL file structure.
 """
 
+import mmap
 import re
 
+# Only the head of the dump is examined: table definitions and the first
+# verbs come early, and the rest of the file is more of the same
+SAMPLE_BYTES = 100000
+INSERT_SAMPLE_BYTES = 50000
+
+# One alternation scanned once over the mmap'd file. The CREATE TABLE body
+# is matched lazily up to the closing ");" so column types with their own
+# parentheses don't cut it short; the last branch picks up quoted words
+# ending in ω outside INSERT statements
+STRUCTURE_RE = re.compile(
+    rb"CREATE TABLE (\w+)\((.*?)\);"
+    rb"|INSERT INTO (\w+) VALUES\s*\(([^)]+)\)"
+    rb"|'([^']*" + 'ω'.encode('utf-8') + rb")'",
+    re.DOTALL,
+)
+COLUMN_RE = re.compile(r'(\w+)\s+([^,\n]+)')
+# Words ending in ω inside an INSERT's values, which the single pass
+# consumes as part of the INSERT match
+VERB_RE = re.compile(r"'([^']*ω)'")
+
+def _decode(raw):
+    """Decode a matched span, tolerating a character cut at the sample edge."""
+    return raw.decode('utf-8', errors='replace')
+
 def examine_sql_structure():
     """Examine the SQL file structure."""
     print("🔍 Examining morphological dictionary SQL structure...")
     
     try:
-        with open('morph-dict-v0.2/dict.sql', 'r', encoding='utf-8') as f:
-            # Read first 1000 lines to understand structure
-            content = f.read(100000)  # First 100KB
-            
-            # Find CREATE TABLE statements
-            create_tables = re.findall(r'CREATE TABLE (\w+)\(([^)]+)\)', content, re.DOTALL)
-            
+        with open('morph-dict-v0.2/dict.sql', 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            create_tables = []
+            inserts = []
+            verbs = []
+
+            # Single linear pass over the first 100KB, dispatching on
+            # whichever branch of the alternation matched
+            for match in STRUCTURE_RE.finditer(mm, 0, min(SAMPLE_BYTES, len(mm))):
+                table_name, table_def, insert_table, values, verb = match.groups()
+                if table_name is not None:
+                    create_tables.append((_decode(table_name), _decode(table_def)))
+                elif insert_table is not None:
+                    values = _decode(values)
+                    if match.end() <= INSERT_SAMPLE_BYTES:
+                        inserts.append((_decode(insert_table), values))
+                    verbs.extend(VERB_RE.findall(values))
+                else:
+                    verbs.append(_decode(verb))
+
             print(f"📋 Found {len(create_tables)} table definitions:")
             
             for table_name, table_def in create_tables:
                 print(f"\n📊 Table: {table_name}")
                 # Extract column definitions
-                columns = re.findall(r'(\w+)\s+([^,\n]+)', table_def)
+                columns = COLUMN_RE.findall(table_def)
                 for col_name, col_type in columns:
                     if col_name.strip() and not col_name.strip().startswith('PRIMARY'):
                         print(f"   • {col_name.strip()}: {col_type.strip()}")
@@ -33,10 +71,6 @@ def examine_sql_structure():
             # Look for INSERT statements to understand data format
             print(f"\n🔍 Looking for data patterns...")
             
-            # Find some INSERT statements
-            insert_pattern = r'INSERT INTO (\w+) VALUES\s*\(([^)]+)\)'
-            inserts = re.findall(insert_pattern, content[:50000])  # First 50KB
-            
             if inserts:
                 print(f"📝 Found {len(inserts)} INSERT statements in sample")
                 for table, values in inserts[:3]:  # Show first 3
@@ -44,8 +78,6 @@ def examine_sql_structure():
             
             # Look for verb-like patterns
             print(f"\n🔍 Looking for verb patterns...")
-            verb_pattern = r"'([^']*ω)'"  # Words ending in ω
-            verbs = re.findall(verb_pattern, content[:100000])
             
             if verbs:
                 print(f"📝 Found {len(verbs)} potential verbs in sample:")
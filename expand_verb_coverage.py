@@ -1,18 +1,113 @@
 #!/usr/bin/env python3
 import sqlite3
 import json
+import os
+import pickle
+import tempfile
+from contextlib import closing
 from datetime import datetime
 
-def get_common_greek_verbs():
+APP_DB_PATH = 'greek-conjugator/backend/greek_conjugator_dev.db'
+
+# The common-verbs aggregate only changes when morph_dict.db is rebuilt, so
+# its result is pickled under a key derived from the file's mtime and size
+COMMON_VERBS_CACHE_DIR = os.path.expanduser('~/.cache/greekconj')
+
+# Verbs added by the expansion get a placeholder gloss built in SQL and
+# fixed group/frequency/difficulty literals, so the only bound parameter is
+# the lemma itself (?1, used twice). A conflicting row is skipped by SQLite
+# rather than raised.
+INSERT_VERB_SQL = """
+    INSERT OR IGNORE INTO verbs (infinitive, english, verb_group, frequency, difficulty)
+    VALUES (?1, 'to ' || ?1, 'A', 5, 3)
+"""
+
+# Copies one lemma's finite forms from the attached morph_dict.db straight
+# into conjugations, mapping the dictionary's tags to the app schema in SQL.
+# The CASE branches are checked in order, like the if/elif chain in
+# import_morph_conjugations.map_tense_mood. Parameters: (verb_id, lemma).
+INSERT_CONJUGATIONS_SQL = """
+    INSERT OR IGNORE INTO conjugations
+    (verb_id, tense, mood, voice, person, number, form)
+    SELECT
+        ?,
+        CASE
+            WHEN w.tense = 'Pres' AND w.mood = 'Ind' THEN 'present'
+            WHEN w.tense = 'Past' AND w.mood = 'Ind' THEN 'imperfect'
+            WHEN w.tense IS NULL AND w.mood = 'Imp' THEN 'present'
+            WHEN w.tense IS NULL AND w.mood = 'Ind' AND w.aspect = 'Perf' THEN 'future'
+            WHEN w.tense IS NULL AND w.mood = 'Ind' AND instr(w.greek_pos, 'AOR') > 0 THEN 'aorist'
+            ELSE 'present'
+        END,
+        CASE
+            WHEN w.tense IN ('Pres', 'Past') AND w.mood = 'Ind' THEN 'indicative'
+            WHEN w.tense IS NULL AND w.mood = 'Imp' THEN 'imperative'
+            WHEN w.tense IS NULL AND w.mood = 'Ind' AND w.aspect = 'Perf' THEN 'indicative'
+            WHEN w.tense IS NULL AND w.mood = 'Ind' AND instr(w.greek_pos, 'AOR_YPOT') > 0 THEN 'subjunctive'
+            ELSE 'indicative'
+        END,
+        CASE
+            WHEN instr(w.greek_pos, 'Pass') > 0 OR instr(w.greek_pos, 'PP') > 0 THEN 'passive'
+            ELSE 'active'
+        END,
+        CASE w.person WHEN 1 THEN '1st' WHEN 2 THEN '2nd' WHEN 3 THEN '3rd' ELSE '1st' END,
+        CASE w.number WHEN 'Sing' THEN 'singular' WHEN 'Plur' THEN 'plural' ELSE 'singular' END,
+        w.form
+    FROM src.words w
+    WHERE w.lemma = ? AND w.pos = 'VERB' AND w.verbform = 'Fin'
+    ORDER BY w.tense, w.mood, w.voice, w.person, w.number
+"""
+
+def common_verbs_cache_path():
+    """Cache file for the common verbs of the current morph_dict.db"""
+    stat = os.stat('morph_dict.db')
+    return os.path.join(
+        COMMON_VERBS_CACHE_DIR,
+        f"common_verbs-{stat.st_mtime_ns:x}-{stat.st_size:x}.pkl"
+    )
+
+def load_common_verbs_cache(cache_path):
+    """Cached common verbs, or None on a miss or an unreadable cache file"""
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"⚠️  Ignoring unreadable common verbs cache: {e}")
+        return None
+
+def save_common_verbs_cache(cache_path, common_verbs):
+    """Write the cache via a temp file, so an interrupted run leaves no partial file"""
+    try:
+        os.makedirs(COMMON_VERBS_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=COMMON_VERBS_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(common_verbs, f)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except Exception as e:
+        print(f"⚠️  Could not cache common verbs: {e}")
+
+def get_common_greek_verbs(cursor):
     """Get a list of common Greek verbs from the morphological dictionary"""
     try:
-        conn = sqlite3.connect('morph_dict.db')
-        cursor = conn.cursor()
-        
+        cache_path = common_verbs_cache_path()
+    except OSError:
+        cache_path = None
+    if cache_path:
+        common_verbs = load_common_verbs_cache(cache_path)
+        if common_verbs is not None:
+            return common_verbs
+    
+    try:
         # Get verbs with high conjugation counts (indicating they're common/complete)
         cursor.execute("""
             SELECT lemma, COUNT(*) as form_count
-            FROM words 
+            FROM src.words 
             WHERE pos = 'VERB' AND verbform = 'Fin'
             GROUP BY lemma
             HAVING form_count >= 20  -- Lowered threshold to get more verbs
@@ -21,204 +116,152 @@ def get_common_greek_verbs():
         """)
         
         common_verbs = cursor.fetchall()
-        conn.close()
-        
-        return common_verbs
-        
     except Exception as e:
         print(f"❌ Error getting common verbs: {e}")
         return []
+    
+    if cache_path:
+        save_common_verbs_cache(cache_path, common_verbs)
+    return common_verbs
 
-def get_existing_verbs():
-    """Get list of verbs already in the app database"""
+def get_existing_verbs(cursor):
+    """Get the set of verbs already in the app database"""
     try:
-        conn = sqlite3.connect('greek-conjugator/backend/greek_conjugator_dev.db')
-        cursor = conn.cursor()
         cursor.execute("SELECT infinitive FROM verbs")
-        existing = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return existing
+        return {row[0] for row in cursor}
     except Exception as e:
         print(f"❌ Error getting existing verbs: {e}")
-        return []
+        return set()
 
-def extract_verb_conjugations(lemma):
-    """Extract all finite forms for a given lemma"""
-    try:
-        conn = sqlite3.connect('morph_dict.db')
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT form, lemma, tense, mood, voice, person, number, aspect, verbform, greek_pos
-            FROM words 
-            WHERE lemma = ? AND pos = 'VERB' AND verbform = 'Fin'
-            ORDER BY tense, mood, voice, person, number
-        """, (lemma,))
-        
-        conjugations = cursor.fetchall()
-        conn.close()
-        
-        forms = []
-        for conj in conjugations:
-            form, lemma, tense, mood, voice, person, number, aspect, verbform, greek_pos = conj
-            forms.append({
-                'form': form,
-                'lemma': lemma,
-                'tense': tense,
-                'mood': mood,
-                'voice': voice,
-                'person': person,
-                'number': number,
-                'aspect': aspect,
-                'verbform': verbform,
-                'greek_pos': greek_pos
-            })
-        
-        return forms
-        
-    except Exception as e:
-        print(f"❌ Error extracting forms for {lemma}: {e}")
-        return []
+# Infinitive endings stripped to compare verbs by stem, longest first so
+# e.g. αγαπάω and αγαπώ both reduce to αγαπ
+STEM_SUFFIXES = ('ιέμαι', 'ομαι', 'άω', 'ώ', 'ω')
 
-def map_tense_mood(tense, mood, aspect, greek_pos):
-    """Map morphological dictionary fields to app schema"""
-    if tense == "Pres" and mood == "Ind":
-        return "present", "indicative"
-    elif tense == "Past" and mood == "Ind":
-        return "imperfect", "indicative"
-    elif tense is None and mood == "Imp":
-        return "present", "imperative"
-    elif tense is None and mood == "Ind" and aspect == "Perf":
-        return "future", "indicative"
-    elif tense is None and mood == "Ind" and "AOR_YPOT" in greek_pos:
-        return "aorist", "subjunctive"
-    elif tense is None and mood == "Ind" and "AOR" in greek_pos:
-        return "aorist", "indicative"
-    else:
-        return "present", "indicative"
-
-def map_voice(greek_pos):
-    """Map voice from greek_pos"""
-    if "Pass" in greek_pos or "PP" in greek_pos:
-        return "passive"
-    else:
-        return "active"
-
-def map_person_number(person, number):
-    """Map person and number to match app's schema"""
-    person_map = {1: "1st", 2: "2nd", 3: "3rd"}
-    number_map = {"Sing": "singular", "Plur": "plural"}
-    
-    return person_map.get(person, "1st"), number_map.get(number, "singular")
+def verb_stem(verb):
+    """Strip the first matching infinitive ending from a verb"""
+    for suffix in STEM_SUFFIXES:
+        if verb.endswith(suffix) and len(verb) > len(suffix):
+            return verb[:-len(suffix)]
+    return verb
+
+def build_substring_trie(strings):
+    """Build a trie of every suffix of every string (dict-of-dicts).
+
+    A key is a substring of one of the strings exactly when it can be walked
+    from the root, so each lookup costs O(len(key)) however many strings
+    were inserted.
+    """
+    root = {}
+    for string in strings:
+        for start in range(len(string)):
+            node = root
+            for char in string[start:]:
+                node = node.setdefault(char, {})
+    return root
+
+def trie_contains(trie, key):
+    """Return True if key is a substring of any string in the trie."""
+    node = trie
+    for char in key:
+        node = node.get(char)
+        if node is None:
+            return False
+    return True
+
+def open_expansion_connection():
+    """Open the app database with morph_dict.db attached as ``src``.
+
+    Every query in the expansion shares this one connection. Transactions
+    are managed explicitly (isolation_level=None), the module-level SQL
+    constants stay compiled in the statement cache across the loop, and
+    the attached dictionary gets a 128MB page cache and is memory-mapped.
+    """
+    conn = sqlite3.connect(APP_DB_PATH, isolation_level=None, cached_statements=256)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("ATTACH DATABASE 'morph_dict.db' AS src")
+    conn.execute("PRAGMA src.cache_size=-131072")
+    conn.execute("PRAGMA src.mmap_size=268435456")
+    return conn
 
 def expand_verb_coverage():
     """Expand verb coverage by adding more common verbs from morphological dictionary"""
     print("🚀 Expanding Verb Coverage")
     print("=" * 50)
     
-    # Get common verbs from dictionary
-    common_verbs = get_common_greek_verbs()
-    print(f"📋 Found {len(common_verbs)} common verbs in morphological dictionary")
-    
-    # Get existing verbs
-    existing_verbs = get_existing_verbs()
-    print(f"📋 Found {len(existing_verbs)} existing verbs in app database")
-    
-    # Filter out verbs that already exist
-    new_verbs = []
-    for lemma, form_count in common_verbs:
-        # Check if this lemma or a similar form already exists
-        exists = False
-        for existing in existing_verbs:
-            if lemma in existing or existing.startswith(lemma):
-                exists = True
-                break
-        
-        if not exists:
-            new_verbs.append((lemma, form_count))
-    
-    print(f"✅ Found {len(new_verbs)} new verbs to add")
-    
-    if not new_verbs:
-        print("❌ No new verbs to add!")
-        return
-    
-    # Add new verbs (limit to top 400 for comprehensive coverage)
-    verbs_to_add = new_verbs[:400]
-    
-    try:
-        conn = sqlite3.connect('greek-conjugator/backend/greek_conjugator_dev.db')
+    with closing(open_expansion_connection()) as conn:
         cursor = conn.cursor()
         
-        added_verbs = 0
-        added_conjugations = 0
+        # Get common verbs from dictionary
+        common_verbs = get_common_greek_verbs(cursor)
+        print(f"📋 Found {len(common_verbs)} common verbs in morphological dictionary")
         
-        for lemma, form_count in verbs_to_add:
-            print(f"\n🔍 Processing: {lemma} ({form_count} forms)")
-            
-            # Add verb to database
-            try:
-                cursor.execute("""
-                    INSERT INTO verbs (infinitive, english, verb_group, frequency, difficulty)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (lemma, f"to {lemma}", "A", 5, 3))
-                
-                verb_id = cursor.lastrowid
-                added_verbs += 1
-                
-                # Extract and add conjugations
-                finite_forms = extract_verb_conjugations(lemma)
-                forms_added = 0
-                
-                for form_data in finite_forms:
-                    tense, mood = map_tense_mood(
-                        form_data['tense'], 
-                        form_data['mood'], 
-                        form_data['aspect'], 
-                        form_data['greek_pos']
-                    )
-                    voice = map_voice(form_data['greek_pos'])
-                    person, number = map_person_number(form_data['person'], form_data['number'])
-                    
-                    try:
-                        cursor.execute("""
-                            INSERT INTO conjugations 
-                            (verb_id, tense, mood, voice, person, number, form)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            verb_id,
-                            tense,
-                            mood,
-                            voice,
-                            person,
-                            number,
-                            form_data['form']
-                        ))
-                        forms_added += 1
-                        added_conjugations += 1
-                    except sqlite3.IntegrityError:
-                        pass  # Skip duplicates
-                
-                print(f"   ✅ Added {forms_added} conjugations")
-                
-            except sqlite3.IntegrityError:
-                print(f"   ⚠️  Verb already exists: {lemma}")
-            except Exception as e:
-                print(f"   ❌ Error adding {lemma}: {e}")
+        # Get existing verbs
+        existing_verbs = get_existing_verbs(cursor)
+        print(f"📋 Found {len(existing_verbs)} existing verbs in app database")
         
-        # Commit changes
-        conn.commit()
-        conn.close()
+        # Filter out verbs that already exist: a lemma is taken if it appears
+        # anywhere in an existing infinitive (this also covers prefixes), or if
+        # it shares a stem with one (e.g. αγαπάω when αγαπώ is present)
+        existing_trie = build_substring_trie(existing_verbs)
+        existing_stems = {verb_stem(verb) for verb in existing_verbs}
+        new_verbs = [
+            (lemma, form_count) for lemma, form_count in common_verbs
+            if verb_stem(lemma) not in existing_stems
+            and not trie_contains(existing_trie, lemma)
+        ]
         
-        print(f"\n📊 Expansion Summary:")
-        print(f"   New verbs added: {added_verbs}")
-        print(f"   New conjugations added: {added_conjugations}")
+        print(f"✅ Found {len(new_verbs)} new verbs to add")
         
-        return True
+        if not new_verbs:
+            print("❌ No new verbs to add!")
+            return
         
-    except Exception as e:
-        print(f"❌ Expansion error: {e}")
-        return False
+        # Add new verbs (limit to top 400 for comprehensive coverage)
+        verbs_to_add = new_verbs[:400]
+        
+        try:
+            added_verbs = 0
+            added_conjugations = 0
+            
+            # The whole expansion is one BEGIN IMMEDIATE ... COMMIT
+            cursor.execute("BEGIN IMMEDIATE")
+            for lemma, form_count in verbs_to_add:
+                print(f"\n🔍 Processing: {lemma} ({form_count} forms)")
+                
+                # Add verb to database
+                try:
+                    cursor.execute(INSERT_VERB_SQL, (lemma,))
+                    if cursor.rowcount == 0:
+                        print(f"   ⚠️  Verb already exists: {lemma}")
+                        continue
+                    
+                    verb_id = cursor.lastrowid
+                    added_verbs += 1
+                    
+                    # Copy and map the conjugations without leaving SQLite;
+                    # duplicates are skipped rather than raised
+                    cursor.execute(INSERT_CONJUGATIONS_SQL, (verb_id, lemma))
+                    forms_added = cursor.rowcount
+                    added_conjugations += forms_added
+                    
+                    print(f"   ✅ Added {forms_added} conjugations")
+                    
+                except Exception as e:
+                    print(f"   ❌ Error adding {lemma}: {e}")
+            
+            # Commit changes
+            cursor.execute("COMMIT")
+            
+            print(f"\n📊 Expansion Summary:")
+            print(f"   New verbs added: {added_verbs}")
+            print(f"   New conjugations added: {added_conjugations}")
+            
+            return True
+            
+        except Exception as e:
+            print(f"❌ Expansion error: {e}")
+            return False
 
 if __name__ == "__main__":
     expand_verb_coverage() 
\ No newline at end of file
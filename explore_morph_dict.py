@@ -11,29 +11,29 @@ import sqlite3
 import os
 import sys
 
-def create_morph_db():
-    """Create the morphological database from the SQL file."""
-    print("🔧 Creating morphological database...")
-    
-    if not os.path.exists("morph-dict-v0.2/dict.sql"):
-        print("❌ Error: dict.sql not found in morph-dict-v0.2/")
-        return False
-    
+from create_morph_db import create_database
+from sqlite_helpers import MORPH_DICT_URI, shared_connection
+
+def analyzed_row_counts(cursor):
+    """Approximate row counts per table from sqlite_stat1 (empty before ANALYZE)."""
     try:
-        # Create database from SQL file
-        os.system("sqlite3 morph_dict.db < morph-dict-v0.2/dict.sql")
-        print("✅ Database created successfully!")
-        return True
-    except Exception as e:
-        print(f"❌ Error creating database: {e}")
-        return False
+        # Each stat starts with the table's row count
+        cursor.execute("""
+            SELECT tbl, MAX(CAST(stat AS INTEGER))
+            FROM sqlite_stat1
+            WHERE tbl IN ('words', 'def', 'norm', 'translations')
+            GROUP BY tbl
+        """)
+    except sqlite3.OperationalError:
+        return {}
+    return dict(cursor.fetchall())
 
 def explore_database():
     """Explore the database structure and content."""
     print("\n🔍 Exploring morphological database...")
     
     try:
-        conn = sqlite3.connect('morph_dict.db')
+        conn = shared_connection(MORPH_DICT_URI)
         cursor = conn.cursor()
         
         # Get table names
@@ -58,9 +58,12 @@ def explore_database():
         for word in sample_words:
             print(f"   • {word}")
         
-        # Count total words
-        cursor.execute("SELECT COUNT(*) FROM words;")
-        total_words = cursor.fetchone()[0]
+        # Count total words, falling back to COUNT(*) if never analyzed
+        row_counts = analyzed_row_counts(cursor)
+        total_words = row_counts.get('words')
+        if total_words is None:
+            cursor.execute("SELECT COUNT(*) FROM words;")
+            total_words = cursor.fetchone()[0]
         print(f"\n📊 Total words in dictionary: {total_words:,}")
         
         # Look for verbs specifically
@@ -82,8 +85,10 @@ def explore_database():
         print("\n🔍 Checking related tables...")
         for table_name in ['def', 'norm', 'translations']:
             try:
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
-                count = cursor.fetchone()[0]
+                count = row_counts.get(table_name)
+                if count is None:
+                    cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
+                    count = cursor.fetchone()[0]
                 print(f"   • {table_name}: {count:,} entries")
                 
                 # Get sample data
@@ -93,8 +98,6 @@ def explore_database():
             except Exception as e:
                 print(f"   • {table_name}: Error - {e}")
         
-        conn.close()
-        
     except Exception as e:
         print(f"❌ Error exploring database: {e}")
         return False
@@ -107,8 +110,8 @@ def search_for_verbs():
     
     try:
         # Connect to both databases
-        morph_conn = sqlite3.connect('morph_dict.db')
-        our_conn = sqlite3.connect('greek-conjugator/backend/greek_conjugator_dev.db')
+        morph_conn = shared_connection(MORPH_DICT_URI)
+        our_conn = shared_connection('greek-conjugator/backend/greek_conjugator_dev.db')
         
         morph_cursor = morph_conn.cursor()
         our_cursor = our_conn.cursor()
@@ -131,9 +134,6 @@ def search_for_verbs():
         
         print(f"\n📊 Found {found_count}/{len(our_verbs)} verbs in morphological dictionary")
         
-        morph_conn.close()
-        our_conn.close()
-        
     except Exception as e:
         print(f"❌ Error searching for verbs: {e}")
 
@@ -144,7 +144,7 @@ def main():
     
     # Create database if it doesn't exist
     if not os.path.exists('morph_dict.db'):
-        if not create_morph_db():
+        if not create_database():
             return
     
     # Explore the database
@@ -7,29 +7,41 @@ Extract verb conjugations from the Greek morphological dictionary
 and import them into our Greek Conjugator database.
 """
 
-import sqlite3
 import json
 import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import groupby
+
+from sqlite_helpers import MORPH_DICT_URI, connect_readonly, shared_connection
+
+# Stay under SQLite's default SQLITE_MAX_VARIABLE_NUMBER (999)
+LEMMA_BATCH_SIZE = 900
+
+# Lemma batches are looked up concurrently, each worker thread on its own
+# connection; SQLite releases the GIL while a query runs
+LOOKUP_WORKERS = 4
+_worker_state = threading.local()
 
 def get_our_verbs_needing_conjugations():
     """Get our verbs that need conjugations."""
     try:
-        conn = sqlite3.connect('greek-conjugator/backend/greek_conjugator_dev.db')
+        conn = shared_connection('greek-conjugator/backend/greek_conjugator_dev.db')
         cursor = conn.cursor()
         
-        # Get verbs without conjugations, ordered by frequency
+        # Get verbs without conjugations, ordered by frequency; NOT EXISTS
+        # stops at the first conjugation found instead of counting them all
         cursor.execute("""
             SELECT v.id, v.infinitive, v.english, v.frequency, v.verb_group
             FROM verbs v
-            LEFT JOIN conjugations c ON v.id = c.verb_id
-            GROUP BY v.id
-            HAVING COUNT(c.id) = 0
+            WHERE NOT EXISTS (SELECT 1 FROM conjugations c WHERE c.verb_id = v.id)
             ORDER BY v.frequency ASC
             LIMIT 50
         """)
         
         verbs = cursor.fetchall()
-        conn.close()
         
         return verbs
         
@@ -37,86 +49,125 @@ def get_our_verbs_needing_conjugations():
         print(f"❌ Error getting our verbs: {e}")
         return []
 
-def find_verb_in_morph_dict(verb_infinitive):
-    """Find a verb and its conjugations in the morphological dictionary."""
+def _find_lemma_batch(batch):
+    """Fetch the verb forms of one batch of lemmas on this thread's connection."""
+    placeholders = ','.join('?' * len(batch))
+    cursor = _worker_state.conn.execute(f"""
+        SELECT form, lemma, pos, tense, mood, voice, person, number, aspect, verbform
+        FROM words 
+        WHERE lemma IN ({placeholders}) AND pos = 'VERB'
+        ORDER BY lemma, tense, mood, voice, person, number
+    """, batch)
+    return cursor.fetchall()
+
+def find_verbs_in_morph_dict(verb_infinitives):
+    """Find many verbs and their conjugations in the morphological dictionary.
+
+    Returns a dict of infinitive -> conjugation rows; verbs that aren't in
+    the dictionary are left out. Infinitives are split into at most
+    LEMMA_BATCH_SIZE per query and spread over LOOKUP_WORKERS threads.
+    """
+    worker_conns = []
+    
+    def open_worker_conn():
+        # Opened in the worker, closed by this thread once the pool is done
+        _worker_state.conn = connect_readonly(MORPH_DICT_URI, check_same_thread=False)
+        worker_conns.append(_worker_state.conn)
+    
     try:
-        conn = sqlite3.connect('morph_dict.db')
-        cursor = conn.cursor()
+        infinitives = list(dict.fromkeys(verb_infinitives))
+        batch_size = min(LEMMA_BATCH_SIZE, max(1, -(-len(infinitives) // LOOKUP_WORKERS)))
+        batches = [infinitives[start:start + batch_size]
+                   for start in range(0, len(infinitives), batch_size)]
         
-        # Find all forms of this verb
-        cursor.execute("""
-            SELECT form, lemma, pos, tense, mood, voice, person, number, aspect, verbform
-            FROM words 
-            WHERE lemma = ? AND pos = 'VERB'
-            ORDER BY tense, mood, voice, person, number
-        """, (verb_infinitive,))
+        conjugations_by_lemma = defaultdict(list)
+        with ThreadPoolExecutor(max_workers=LOOKUP_WORKERS, initializer=open_worker_conn) as executor:
+            # Find all forms of these verbs
+            for rows in executor.map(_find_lemma_batch, batches):
+                for conj in rows:
+                    conjugations_by_lemma[conj[1]].append(conj)
         
-        conjugations = cursor.fetchall()
-        conn.close()
-        
-        return conjugations
+        return dict(conjugations_by_lemma)
         
     except Exception as e:
-        print(f"❌ Error finding verb {verb_infinitive}: {e}")
-        return []
+        print(f"❌ Error finding verbs: {e}")
+        return {}
+    finally:
+        for conn in worker_conns:
+            conn.close()
+
+# Morphological dictionary tag -> our schema value
+TENSE_MAPPING = {
+    'Pres': 'present',
+    'Past': 'imperfect',  # Assuming Past is imperfect
+    'Fut': 'future',
+    'Perf': 'perfect',
+    'Aor': 'aorist'
+}
+
+MOOD_MAPPING = {
+    'Ind': 'indicative',
+    'Imp': 'imperative',
+    'Sub': 'subjunctive'
+}
+
+VOICE_MAPPING = {
+    'Act': 'active',
+    'Pass': 'passive',
+    'Mid': 'middle'
+}
+
+PERSON_MAPPING = {
+    1: '1st',
+    2: '2nd', 
+    3: '3rd'
+}
+
+NUMBER_MAPPING = {
+    'Sing': 'singular',
+    'Plur': 'plural'
+}
+
+@lru_cache(maxsize=4096)
+def map_morph_tags(tense, mood, voice, person, number):
+    """Map one row's tags to our (tense, mood, voice, person, number).
+
+    The same few tag combinations repeat across every verb, so each is
+    mapped once and later rows are cache hits.
+    """
+    return (
+        TENSE_MAPPING.get(tense, tense.lower()),
+        MOOD_MAPPING.get(mood, mood.lower()),
+        VOICE_MAPPING.get(voice, voice.lower()),
+        PERSON_MAPPING.get(person, str(person)),
+        NUMBER_MAPPING.get(number, number.lower())
+    )
+
+# Columns of a mapped conjugation table, in the order each row is written
+CONJUGATION_FIELDS = ('form', 'tense', 'mood', 'voice', 'person', 'number', 'aspect', 'verbform')
 
 def map_morph_to_our_schema(morph_conjugations):
-    """Map morphological dictionary data to our database schema."""
-    mapped_conjugations = []
+    """Map morphological dictionary data to our database schema.
+
+    Returns the conjugations column-wise, as a dict of CONJUGATION_FIELDS
+    -> list, rather than one dict per row. The tag columns hold the shared
+    strings from the mapping constants, so a column costs one pointer per
+    row; conjugation_rows() turns it back into row dicts for output.
+    """
+    if not morph_conjugations:
+        return {field: [] for field in CONJUGATION_FIELDS}
     
-    for conj in morph_conjugations:
-        form, lemma, pos, tense, mood, voice, person, number, aspect, verbform = conj
-        
-        # Map tense
-        tense_mapping = {
-            'Pres': 'present',
-            'Past': 'imperfect',  # Assuming Past is imperfect
-            'Fut': 'future',
-            'Perf': 'perfect',
-            'Aor': 'aorist'
-        }
-        
-        # Map mood
-        mood_mapping = {
-            'Ind': 'indicative',
-            'Imp': 'imperative',
-            'Sub': 'subjunctive'
-        }
-        
-        # Map voice
-        voice_mapping = {
-            'Act': 'active',
-            'Pass': 'passive',
-            'Mid': 'middle'
-        }
-        
-        # Map person
-        person_mapping = {
-            1: '1st',
-            2: '2nd', 
-            3: '3rd'
-        }
-        
-        # Map number
-        number_mapping = {
-            'Sing': 'singular',
-            'Plur': 'plural'
-        }
-        
-        mapped_conj = {
-            'form': form,
-            'tense': tense_mapping.get(tense, tense.lower()),
-            'mood': mood_mapping.get(mood, mood.lower()),
-            'voice': voice_mapping.get(voice, voice.lower()),
-            'person': person_mapping.get(person, str(person)),
-            'number': number_mapping.get(number, number.lower()),
-            'aspect': aspect,
-            'verbform': verbform
-        }
-        
-        mapped_conjugations.append(mapped_conj)
+    forms, _, _, tenses, moods, voices, persons, numbers, aspects, verbforms = zip(*morph_conjugations)
+    tenses, moods, voices, persons, numbers = zip(*map(map_morph_tags, tenses, moods, voices, persons, numbers))
     
-    return mapped_conjugations
+    return dict(zip(CONJUGATION_FIELDS, map(list, (
+        forms, tenses, moods, voices, persons, numbers, aspects, verbforms
+    ))))
+
+def conjugation_rows(columns):
+    """Yield the rows of a column-wise conjugation table as dicts."""
+    for values in zip(*(columns[field] for field in CONJUGATION_FIELDS)):
+        yield dict(zip(CONJUGATION_FIELDS, values))
 
 def analyze_verb_coverage():
     """Analyze how many of our verbs are in the morphological dictionary."""
@@ -130,33 +181,48 @@ def analyze_verb_coverage():
     found_verbs = []
     not_found = []
     
-    for verb_id, infinitive, english, frequency, verb_group in our_verbs:
-        conjugations = find_verb_in_morph_dict(infinitive)
-        
-        if conjugations:
-            print(f"   ✅ {infinitive} ({english}) - {len(conjugations)} conjugations")
-            found_verbs.append({
-                'verb_id': verb_id,
-                'infinitive': infinitive,
-                'english': english,
-                'frequency': frequency,
-                'verb_group': verb_group,
-                'conjugation_count': len(conjugations),
-                'conjugations': map_morph_to_our_schema(conjugations)
-            })
-        else:
-            print(f"   ❌ {infinitive} ({english}) - Not found")
-            not_found.append(infinitive)
-    
-    print(f"\n📊 Summary:")
-    print(f"   • Found: {len(found_verbs)} verbs")
-    print(f"   • Not found: {len(not_found)} verbs")
-    print(f"   • Coverage: {len(found_verbs)/len(our_verbs)*100:.1f}%")
+    # One batched lookup for every verb instead of a query per verb
+    morph_conjugations = find_verbs_in_morph_dict(
+        infinitive for _, infinitive, _, _, _ in our_verbs
+    )
     
-    # Save results
+    # Results are streamed to the file as each verb is found, so only one
+    # verb's conjugation rows exist as dicts at a time
     with open('verb_coverage_analysis.json', 'w', encoding='utf-8') as f:
-        json.dump({
-            'found_verbs': found_verbs,
+        f.write('{"found_verbs": [')
+        
+        for verb_id, infinitive, english, frequency, verb_group in our_verbs:
+            conjugations = morph_conjugations.get(infinitive, [])
+            
+            if conjugations:
+                print(f"   ✅ {infinitive} ({english}) - {len(conjugations)} conjugations")
+                verb_data = {
+                    'verb_id': verb_id,
+                    'infinitive': infinitive,
+                    'english': english,
+                    'frequency': frequency,
+                    'verb_group': verb_group,
+                    'conjugation_count': len(conjugations),
+                    'conjugations': map_morph_to_our_schema(conjugations)
+                }
+                if found_verbs:
+                    f.write(', ')
+                f.write(json.dumps(
+                    {**verb_data, 'conjugations': list(conjugation_rows(verb_data['conjugations']))},
+                    ensure_ascii=False
+                ))
+                found_verbs.append(verb_data)
+            else:
+                print(f"   ❌ {infinitive} ({english}) - Not found")
+                not_found.append(infinitive)
+        
+        print(f"\n📊 Summary:")
+        print(f"   • Found: {len(found_verbs)} verbs")
+        print(f"   • Not found: {len(not_found)} verbs")
+        print(f"   • Coverage: {len(found_verbs)/len(our_verbs)*100:.1f}%")
+        
+        # Close the array and append the remaining keys of the object
+        rest = json.dumps({
             'not_found': not_found,
             'summary': {
                 'total_analyzed': len(our_verbs),
@@ -164,7 +230,8 @@ def analyze_verb_coverage():
                 'not_found': len(not_found),
                 'coverage_percentage': len(found_verbs)/len(our_verbs)*100
             }
-        }, f, ensure_ascii=False, indent=2)
+        }, ensure_ascii=False)
+        f.write('], ' + rest[1:])
     
     print(f"💾 Saved analysis to 'verb_coverage_analysis.json'")
     
@@ -180,18 +247,16 @@ def show_sample_conjugations(found_verbs, num_verbs=3):
         print(f"   Frequency: {verb_data['frequency']}, Group: {verb_data['verb_group']}")
         print(f"   Total conjugations: {verb_data['conjugation_count']}")
         
-        # Show sample conjugations by tense
-        tenses = {}
-        for conj in verb_data['conjugations']:
-            tense = conj['tense']
-            if tense not in tenses:
-                tenses[tense] = []
-            tenses[tense].append(conj)
-        
-        for tense, conjugations in tenses.items():
-            print(f"   📚 {tense.title()} tense ({len(conjugations)} forms):")
-            for conj in conjugations[:5]:  # Show first 5
-                print(f"     • {conj['form']} ({conj['person']} {conj['number']} {conj['mood']} {conj['voice']})")
+        # Show sample conjugations by tense. Rows come sorted by tense, so
+        # each tense is one consecutive run of the column
+        columns = verb_data['conjugations']
+        start = 0
+        for tense, run in groupby(columns['tense']):
+            count = sum(1 for _ in run)
+            print(f"   📚 {tense.title()} tense ({count} forms):")
+            for row in range(start, start + min(count, 5)):  # Show first 5
+                print(f"     • {columns['form'][row]} ({columns['person'][row]} {columns['number'][row]} {columns['mood'][row]} {columns['voice'][row]})")
+            start += count
 
 def main():
     """Main extraction function."""
@@ -1,24 +1,122 @@
 from flask import Flask, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from flask_session import Session
+from cachelib import RedisCache, SimpleCache
+from sqlalchemy import event, text
+from sqlalchemy.pool import QueuePool
+import atexit
+import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
+import orjson
 
 load_dotenv()
 
+# Applied to every new SQLite connection: WAL lets readers run alongside a
+# writer, and memory-mapped I/O plus a ~64MB page cache keep hot verb and
+# conjugation pages out of the syscall path
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+)
+
+# Bump whenever the models gain tables or indexes, so existing databases
+# get them on the next start
+SCHEMA_VERSION = 1
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson's C encoder.
+
+    orjson writes datetimes as ISO 8601 itself, so models hand them over
+    as-is; anything else it can't encode goes to Flask's default hook.
+    """
+
+    def _encode(self, obj, indent=False, option=0):
+        option |= orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        return self._encode(obj, indent=kwargs.get('indent')).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response rather than decoding
+        # them to str for Flask to encode again
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = self._encode(obj, indent=indent, option=orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def configure_logging():
+    """Route the app's loggers through a queue drained by a listener thread,
+    so request threads never block writing to stderr."""
+    package_logger = logging.getLogger(__name__)
+    if package_logger.handlers:
+        return
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, logging.StreamHandler())
+    listener.start()
+    atexit.register(listener.stop)
+    package_logger.addHandler(QueueHandler(log_queue))
+    package_logger.setLevel(logging.INFO)
+
 def create_app():
+    configure_logging()
     app = Flask(__name__, static_folder='../../frontend/build')
+    app.json = OrjsonProvider(app)
     CORS(app, supports_credentials=True, origins=['http://localhost:3000'])
 
     # Use SQLite for local development - point to the main database with full dataset
     db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'greek_conjugator_dev.db')
     app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Keep a pool of long-lived connections so each request reuses a warm
+    # page cache and the pragmas above instead of reopening the file.
+    # Pooled connections move between worker threads, hence check_same_thread
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'poolclass': QueuePool,
+        'pool_size': 10,
+        'max_overflow': 5,
+        'pool_recycle': 3600,
+        'connect_args': {'check_same_thread': False, 'timeout': 30},
+    }
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key')
 
-    # Session configuration
-    app.config['SESSION_TYPE'] = 'filesystem'
+    # Session configuration: sessions live in an in-process cache, so
+    # reading user_id is a dict lookup rather than a file read and unpickle.
+    # Set SESSION_REDIS_URL to share sessions across worker processes; that
+    # needs the optional redis package, and without it sessions stay in-process
+    app.config['SESSION_TYPE'] = 'cachelib'
+    redis_url = os.environ.get('SESSION_REDIS_URL')
+    session_cache = SimpleCache(threshold=500)
+    if redis_url:
+        try:
+            import redis
+        except ImportError:
+            app.logger.warning("SESSION_REDIS_URL is set but redis is not installed; "
+                               "keeping sessions in-process")
+        else:
+            session_cache = RedisCache(host=redis.from_url(redis_url))
+    app.config['SESSION_CACHELIB'] = session_cache
     app.config['SESSION_PERMANENT'] = False
     app.config['SESSION_USE_SIGNER'] = True
     app.config['SESSION_KEY_PREFIX'] = 'greek_conjugator:'
@@ -29,6 +127,10 @@ def create_app():
     app.config['TTS_RPM_LIMIT'] = int(os.environ.get('TTS_RPM_LIMIT', '60'))
     app.config['TTS_DAILY_CHAR_LIMIT'] = int(os.environ.get('TTS_DAILY_CHAR_LIMIT', '50000'))
 
+    # Consistency checks on each freshly built dashboard payload; always on
+    # in debug mode, otherwise opt in with DASHBOARD_VALIDATE=1
+    app.config['DASHBOARD_VALIDATE'] = os.environ.get('DASHBOARD_VALIDATE', '0') == '1'
+
     # Initialize database
     from .models import db
     db.init_app(app)
@@ -45,7 +147,19 @@ def create_app():
 
     # Create tables if they don't exist
     with app.app_context():
-        db.create_all()
+        event.listen(db.engine, 'connect', set_sqlite_pragmas)
+        # PRAGMA user_version records the schema already applied, so warm
+        # starts skip the per-table checks create_all would run
+        with db.engine.begin() as conn:
+            schema_version = conn.execute(text("PRAGMA user_version")).scalar()
+            if schema_version < SCHEMA_VERSION:
+                db.metadata.create_all(conn)
+                # create_all skips tables that already exist, so add any
+                # model indexes missing from an older database
+                for table in db.metadata.sorted_tables:
+                    for index in table.indexes:
+                        index.create(conn, checkfirst=True)
+                conn.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
 
     # Serve React app for SPA routing
     @app.route('/', defaults={'path': ''})
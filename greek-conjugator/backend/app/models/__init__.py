@@ -1,6 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+from operator import attrgetter
 
 db = SQLAlchemy()
 
@@ -21,19 +22,19 @@ class User(db.Model):
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
 
+    # to_dict keys; attrgetter reads them all in one C-level call, and
+    # datetimes are left for the app's orjson provider to encode
+    _dict_keys = ('id', 'email', 'username', 'subscription_tier', 'created_at', 'last_login', 'preferences')
+    _dict_values = attrgetter(*_dict_keys)
+
     def to_dict(self):
-        return {
-            'id': self.id,
-            'email': self.email,
-            'username': self.username,
-            'subscription_tier': self.subscription_tier,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'last_login': self.last_login.isoformat() if self.last_login else None,
-            'preferences': self.preferences
-        }
+        return dict(zip(self._dict_keys, self._dict_values(self)))
 
 class Verb(db.Model):
     __tablename__ = 'verbs'
+    __table_args__ = (
+        db.Index('ix_verbs_infinitive', 'infinitive'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     infinitive = db.Column(db.String(100), nullable=False)
     english = db.Column(db.String(255), nullable=False)
@@ -45,22 +46,19 @@ class Verb(db.Model):
     audio_url = db.Column(db.String(500))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    _dict_keys = ('id', 'infinitive', 'english', 'frequency', 'difficulty', 'verb_group',
+                  'transitivity', 'tags', 'audio_url', 'created_at')
+    _dict_values = attrgetter(*_dict_keys)
+
     def to_dict(self):
-        return {
-            'id': self.id,
-            'infinitive': self.infinitive,
-            'english': self.english,
-            'frequency': self.frequency,
-            'difficulty': self.difficulty,
-            'verb_group': self.verb_group,
-            'transitivity': self.transitivity,
-            'tags': self.tags,
-            'audio_url': self.audio_url,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        return dict(zip(self._dict_keys, self._dict_values(self)))
 
 class Conjugation(db.Model):
     __tablename__ = 'conjugations'
+    # Leads with verb_id, so it also serves as the foreign key index
+    __table_args__ = (
+        db.Index('ix_conj_verb_tmv', 'verb_id', 'tense', 'mood', 'voice'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     verb_id = db.Column(db.Integer, db.ForeignKey('verbs.id'), nullable=False)
     tense = db.Column(db.String(50), nullable=False)  # Changed from Enum for SQLite
@@ -73,23 +71,18 @@ class Conjugation(db.Model):
     stress_pattern = db.Column(db.String(50))
     morphology = db.Column(db.Text)  # Changed from JSON for SQLite
 
+    _dict_keys = ('id', 'verb_id', 'tense', 'mood', 'voice', 'person', 'number', 'form',
+                  'audio_url', 'stress_pattern', 'morphology')
+    _dict_values = attrgetter(*_dict_keys)
+
     def to_dict(self):
-        return {
-            'id': self.id,
-            'verb_id': self.verb_id,
-            'tense': self.tense,
-            'mood': self.mood,
-            'voice': self.voice,
-            'person': self.person,
-            'number': self.number,
-            'form': self.form,
-            'audio_url': self.audio_url,
-            'stress_pattern': self.stress_pattern,
-            'morphology': self.morphology
-        }
+        return dict(zip(self._dict_keys, self._dict_values(self)))
 
 class UserProgress(db.Model):
     __tablename__ = 'user_progress'
+    __table_args__ = (
+        db.Index('ix_progress_user_next', 'user_id', 'next_review'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     verb_id = db.Column(db.Integer, db.ForeignKey('verbs.id'), nullable=False)
@@ -104,22 +97,15 @@ class UserProgress(db.Model):
     common_mistakes = db.Column(db.Text)  # Changed from JSON for SQLite
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    _dict_keys = ('id', 'user_id', 'verb_id', 'conjugation_id', 'attempts', 'correct_attempts',
+                  'last_attempt', 'next_review', 'ease_factor', 'interval_days', 'streak',
+                  'common_mistakes', 'created_at')
+    _dict_values = attrgetter(*_dict_keys)
+
     def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'verb_id': self.verb_id,
-            'conjugation_id': self.conjugation_id,
-            'attempts': self.attempts,
-            'correct_attempts': self.correct_attempts,
-            'last_attempt': self.last_attempt.isoformat() if self.last_attempt else None,
-            'next_review': self.next_review.isoformat() if self.next_review else None,
-            'ease_factor': float(self.ease_factor),
-            'interval_days': self.interval_days,
-            'streak': self.streak,
-            'common_mistakes': self.common_mistakes,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        data = dict(zip(self._dict_keys, self._dict_values(self)))
+        data['ease_factor'] = float(data['ease_factor'])
+        return data
 
 class PracticeSession(db.Model):
     __tablename__ = 'practice_sessions'
@@ -133,18 +119,14 @@ class PracticeSession(db.Model):
     accuracy_rate = db.Column(db.Float)    # Changed from Numeric for SQLite
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    _dict_keys = ('id', 'user_id', 'session_type', 'duration_seconds', 'questions_attempted',
+                  'correct_answers', 'verbs_practiced', 'accuracy_rate', 'created_at')
+    _dict_values = attrgetter(*_dict_keys)
+
     def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'session_type': self.session_type,
-            'duration_seconds': self.duration_seconds,
-            'questions_attempted': self.questions_attempted,
-            'correct_answers': self.correct_answers,
-            'verbs_practiced': self.verbs_practiced,
-            'accuracy_rate': float(self.accuracy_rate) if self.accuracy_rate else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        data = dict(zip(self._dict_keys, self._dict_values(self)))
+        data['accuracy_rate'] = float(data['accuracy_rate']) if data['accuracy_rate'] else None
+        return data
 
 
 class AudioUsage(db.Model):
@@ -155,10 +137,8 @@ class AudioUsage(db.Model):
     requests_count = db.Column(db.Integer, default=0)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    _dict_keys = ('usage_date', 'chars_used', 'requests_count', 'updated_at')
+    _dict_values = attrgetter(*_dict_keys)
+
     def to_dict(self):
-        return {
-            'usage_date': self.usage_date,
-            'chars_used': self.chars_used,
-            'requests_count': self.requests_count,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        return dict(zip(self._dict_keys, self._dict_values(self)))
\ No newline at end of file
@@ -1,5 +1,6 @@
 import os
 from flask import Blueprint, jsonify, send_from_directory, current_app
+from sqlalchemy.orm import load_only
 from ..models import Conjugation
 from .auth import login_required
 from ..services.audio import get_audio_service, RateLimitError
@@ -17,7 +18,10 @@ def serve_audio_file(filename):
 @login_required
 def generate_conjugation_audio(conjugation_id):
     try:
-        conjugation = Conjugation.query.get_or_404(conjugation_id)
+        # ensure_conjugation_audio only reads these columns
+        conjugation = Conjugation.query.options(
+            load_only(Conjugation.id, Conjugation.form, Conjugation.audio_url)
+        ).filter_by(id=conjugation_id).first_or_404()
         service = get_audio_service(current_app)
         audio_url = service.ensure_conjugation_audio(conjugation)
         return jsonify({"audio_url": audio_url})
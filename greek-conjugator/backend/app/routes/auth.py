@@ -1,9 +1,107 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, current_app, g
 from ..models import db, User
+from sqlalchemy import bindparam, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from collections import OrderedDict
 from datetime import datetime
 from functools import wraps
+import atexit
+import hashlib
+import hmac
+import logging
+import threading
+import time
 
 bp = Blueprint('auth', __name__, url_prefix='/api/auth')
+logger = logging.getLogger(__name__)
+
+# Recently verified logins, so a repeat login skips the PBKDF2 hash. Maps
+# email -> (token, expiry), where token is an HMAC under the app secret of
+# the user id, the stored password hash and the submitted password: no
+# plaintext is kept, and changing the password invalidates the entry.
+# Only successful checks are cached, so failed guesses always pay full cost.
+LOGIN_CACHE_TTL = 60  # seconds
+LOGIN_CACHE_SIZE = 1024
+_login_cache = OrderedDict()
+_login_cache_lock = threading.Lock()
+
+def _login_token(user, password):
+    key = current_app.secret_key
+    if isinstance(key, str):
+        key = key.encode()
+    message = f"{user.id}:{user.password_hash}:{password}".encode()
+    return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+def verify_login(user, password):
+    """Check password for user, reusing a successful check from the last minute"""
+    token = _login_token(user, password)
+    now = time.monotonic()
+    with _login_cache_lock:
+        cached = _login_cache.get(user.email)
+        if cached and cached[1] > now and hmac.compare_digest(cached[0], token):
+            _login_cache.move_to_end(user.email)
+            return True
+
+    if not user.check_password(password):
+        return False
+
+    with _login_cache_lock:
+        _login_cache[user.email] = (token, now + LOGIN_CACHE_TTL)
+        _login_cache.move_to_end(user.email)
+        while len(_login_cache) > LOGIN_CACHE_SIZE:
+            _login_cache.popitem(last=False)
+    return True
+
+# last_login is bookkeeping, so logins queue it here and a background
+# thread writes the batch every few seconds instead of each login committing
+LAST_LOGIN_FLUSH_INTERVAL = 5  # seconds
+_pending_logins = {}
+_pending_logins_lock = threading.Lock()
+_login_flusher = None
+
+def flush_pending_logins():
+    """Write all queued last_login times in one executemany."""
+    with _pending_logins_lock:
+        pending = list(_pending_logins.items())
+        _pending_logins.clear()
+    if not pending:
+        return
+    users = User.__table__
+    stmt = users.update().where(users.c.id == bindparam('user_id')).values(last_login=bindparam('login_time'))
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(stmt, [{'user_id': user_id, 'login_time': login_time} for user_id, login_time in pending])
+    except Exception:
+        # Put the batch back for the next flush, keeping any newer login
+        with _pending_logins_lock:
+            for user_id, login_time in pending:
+                queued = _pending_logins.get(user_id)
+                if queued is None or queued < login_time:
+                    _pending_logins[user_id] = login_time
+        raise
+
+def record_login(user):
+    global _login_flusher
+    with _pending_logins_lock:
+        _pending_logins[user.id] = datetime.utcnow()
+        if _login_flusher is None:
+            app = current_app._get_current_object()
+
+            def flush_with_app():
+                with app.app_context():
+                    flush_pending_logins()
+
+            def flush_periodically():
+                while True:
+                    time.sleep(LAST_LOGIN_FLUSH_INTERVAL)
+                    try:
+                        flush_with_app()
+                    except Exception:
+                        logger.exception("Failed to record logins")
+
+            _login_flusher = threading.Thread(target=flush_periodically, daemon=True)
+            _login_flusher.start()
+            atexit.register(flush_with_app)
 
 def login_required(f):
     @wraps(f)
@@ -13,6 +111,13 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def get_current_user():
+    """Return the logged-in User, loading it at most once per request"""
+    if 'current_user' not in g:
+        user_id = session.get('user_id')
+        g.current_user = db.session.get(User, user_id) if user_id is not None else None
+    return g.current_user
+
 @bp.route('/register', methods=['POST'])
 def register():
     try:
@@ -24,10 +129,13 @@ def register():
         if not email or not password:
             return jsonify({'error': 'Email and password are required'}), 400
 
-        if User.query.filter_by(email=email).first():
-            return jsonify({'error': 'Email already registered'}), 400
-
-        if username and User.query.filter_by(username=username).first():
+        # Duplicates are turned away before paying for the password hash
+        taken = db.session.query(User.email).filter(
+            or_(User.email == email, User.username == username) if username else User.email == email
+        ).first()
+        if taken:
+            if taken.email == email:
+                return jsonify({'error': 'Email already registered'}), 400
             return jsonify({'error': 'Username already taken'}), 400
 
         new_user = User(
@@ -35,7 +143,22 @@ def register():
             username=username,
         )
         new_user.set_password(password)
-        db.session.add(new_user)
+
+        # ON CONFLICT only catches a registration racing past the check
+        # above; a clash on either UNIQUE column inserts nothing
+        stmt = sqlite_insert(User).values(
+            email=new_user.email,
+            username=new_user.username,
+            password_hash=new_user.password_hash,
+        ).on_conflict_do_nothing().returning(User.id)
+        new_user_id = db.session.execute(stmt).scalar()
+
+        if new_user_id is None:
+            db.session.rollback()
+            if User.query.filter_by(email=email).first():
+                return jsonify({'error': 'Email already registered'}), 400
+            return jsonify({'error': 'Username already taken'}), 400
+
         db.session.commit()
 
         return jsonify({'success': True, 'message': 'User registered successfully'}), 201
@@ -51,12 +174,11 @@ def login():
 
         user = User.query.filter_by(email=email).first()
 
-        if user and user.check_password(password):
+        if user and verify_login(user, password):
             session['user_id'] = user.id
             session['username'] = user.username
 
-            user.last_login = datetime.utcnow()
-            db.session.commit()
+            record_login(user)
 
             return jsonify({
                 'success': True,
@@ -79,17 +201,16 @@ def logout():
 
 @bp.route('/check', methods=['GET'])
 def check_auth():
-    if 'user_id' in session:
-        user = User.query.get(session['user_id'])
-        if user:
-            return jsonify({
-                'authenticated': True,
-                'user': {
-                    'id': user.id,
-                    'username': user.username,
-                    'email': user.email
-                }
-            })
+    user = get_current_user()
+    if user:
+        return jsonify({
+            'authenticated': True,
+            'user': {
+                'id': user.id,
+                'username': user.username,
+                'email': user.email
+            }
+        })
     return jsonify({'authenticated': False})
 
 @bp.route('/reset-password', methods=['POST'])
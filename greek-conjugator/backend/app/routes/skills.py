@@ -5,6 +5,7 @@ Handles skill tree, progress tracking, and mastery levels
 
 from flask import Blueprint, jsonify, request, session
 from ..models import db
+from .dashboard import invalidate_dashboard_stats
 from datetime import datetime
 from functools import wraps
 
@@ -69,6 +70,7 @@ def get_user_skills(user_id):
                 }
             )
             db.session.commit()
+            invalidate_dashboard_stats(user_id)
             
             # Refetch
             user_skill = db.session.execute(
@@ -287,6 +289,8 @@ def record_practice():
                 )
                 db.session.commit()
         
+        invalidate_dashboard_stats(user_id)
+        
         return jsonify({
             'success': True,
             'attempts': user_skill[4],
@@ -187,10 +187,9 @@ def submit_answer():
             progress.streak = 0
             progress = update_spaced_repetition(progress, quality=0)  # Wrong answer
             # Track common mistakes
+            # Appending to the stored text avoids a split and re-join
             if progress.common_mistakes:
-                mistakes_list = progress.common_mistakes.split(',') if progress.common_mistakes else []
-                mistakes_list.append(user_answer)
-                progress.common_mistakes = ','.join(mistakes_list)
+                progress.common_mistakes = f"{progress.common_mistakes},{user_answer}"
             else:
                 progress.common_mistakes = user_answer
         
@@ -8,6 +8,7 @@ Provides endpoints for vocabulary flashcard practice with spaced repetition.
 from flask import Blueprint, jsonify, request, session
 from ..models import db
 from .auth import login_required
+from .dashboard import invalidate_dashboard_stats
 from ..services.greek_text import compare_greek_texts
 from datetime import datetime, timedelta
 import random
@@ -55,6 +56,7 @@ def create_user_vocab_progress(user_id, word_id):
         {"user_id": user_id, "word_id": word_id}
     )
     db.session.commit()
+    invalidate_dashboard_stats(user_id)
 
 
 def get_today_new_words_count(user_id):
@@ -201,6 +203,7 @@ def update_vocab_progress(user_id, word_id, is_correct):
         }
     )
     db.session.commit()
+    invalidate_dashboard_stats(user_id)
     
     return {
         "attempts": attempts,
@@ -0,0 +1,203 @@
+"""
+Regression checks for the comprehensive dashboard endpoint: the aggregate
+counts it reports, and that its per-user cache never serves a payload that
+differs from a fresh computation, before or after vocabulary and skill writes.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+
+from app import OrjsonProvider
+from app.models import db
+from app.routes import dashboard, skills, vocabulary
+
+# Tables the vocabulary and skill routes query with raw SQL; they are built
+# by scripts/build_vocabulary.py and the skill tree setup, not by the models
+SCHEMA = (
+    """CREATE TABLE common_words (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        word TEXT NOT NULL UNIQUE,
+        english TEXT NOT NULL,
+        word_type TEXT NOT NULL
+    )""",
+    """CREATE TABLE user_vocabulary_progress (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        word_id INTEGER NOT NULL,
+        attempts INTEGER DEFAULT 0,
+        correct_attempts INTEGER DEFAULT 0,
+        last_attempt DATETIME,
+        next_review DATETIME,
+        ease_factor REAL DEFAULT 2.5,
+        interval_days INTEGER DEFAULT 1,
+        mastery_level INTEGER DEFAULT 0,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(user_id, word_id)
+    )""",
+    """CREATE TABLE conjugation_skill_definitions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        category TEXT NOT NULL UNIQUE,
+        display_name TEXT,
+        display_name_greek TEXT,
+        tier INTEGER,
+        difficulty INTEGER,
+        icon TEXT,
+        description TEXT,
+        unlock_requirement TEXT,
+        form_count INTEGER
+    )""",
+    """CREATE TABLE user_conjugation_skills (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        tier INTEGER,
+        attempts INTEGER DEFAULT 0,
+        correct INTEGER DEFAULT 0,
+        mastery_level INTEGER DEFAULT 0,
+        unlocked BOOLEAN DEFAULT 0,
+        last_practice DATETIME,
+        UNIQUE(user_id, category)
+    )""",
+)
+
+USER_ID = 1
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'dashboard.db'}"
+    app.config['SECRET_KEY'] = 'test'
+    app.config['DASHBOARD_VALIDATE'] = True
+    db.init_app(app)
+    for module in (dashboard, vocabulary, skills):
+        app.register_blueprint(module.bp)
+
+    week_ago = datetime.utcnow() - timedelta(days=7)
+    with app.app_context():
+        for statement in SCHEMA:
+            db.session.execute(db.text(statement))
+        db.session.execute(
+            db.text("INSERT INTO common_words (word, english, word_type) VALUES (:word, :english, 'noun')"),
+            [{"word": f"λέξη{i}", "english": f"word {i}"} for i in range(10)]
+        )
+        # One studied word per mastery level 0-4, all reviewed a week ago
+        db.session.execute(
+            db.text("""
+                INSERT INTO user_vocabulary_progress
+                (user_id, word_id, attempts, correct_attempts, last_attempt, next_review,
+                 ease_factor, interval_days, mastery_level, created_at)
+                VALUES (:user_id, :word_id, 4, :correct, :week_ago, :next_review,
+                        :ease, :interval, :level, :week_ago)
+            """),
+            [
+                {"user_id": USER_ID, "word_id": level + 1, "correct": level, "week_ago": week_ago,
+                 "next_review": week_ago + timedelta(days=30 * level), "ease": 2.3 + 0.1 * level,
+                 "interval": 30 * level, "level": level}
+                for level in range(5)
+            ]
+        )
+        db.session.execute(
+            db.text("""
+                INSERT INTO conjugation_skill_definitions
+                (category, display_name, tier, difficulty, unlock_requirement)
+                VALUES (:category, :name, :tier, 1, NULL)
+            """),
+            [
+                {"category": "present_active", "name": "Present", "tier": 1},
+                {"category": "aorist_active", "name": "Aorist", "tier": 2},
+            ]
+        )
+        db.session.execute(
+            db.text("""
+                INSERT INTO user_conjugation_skills
+                (user_id, category, tier, attempts, correct, mastery_level, unlocked)
+                VALUES (:user_id, :category, :tier, :attempts, :correct, :mastery, 1)
+            """),
+            [
+                {"user_id": USER_ID, "category": "present_active", "tier": 1,
+                 "attempts": 40, "correct": 36, "mastery": 4},
+                {"user_id": USER_ID, "category": "aorist_active", "tier": 2,
+                 "attempts": 10, "correct": 5, "mastery": 1},
+            ]
+        )
+        db.session.commit()
+
+    dashboard._dashboard_cache.clear()
+    test_client = app.test_client()
+    with test_client.session_transaction() as sess:
+        sess['user_id'] = USER_ID
+    yield test_client
+    with app.app_context():
+        db.engine.dispose()
+    dashboard._dashboard_cache.clear()
+
+
+def get_stats(client):
+    response = client.get('/api/dashboard/comprehensive')
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def fresh_stats(client):
+    """The payload recomputed from the database, bypassing the cache."""
+    dashboard._dashboard_cache.clear()
+    return get_stats(client)
+
+
+def test_dashboard_counts_from_seeded_progress(client):
+    stats = get_stats(client)
+    vocab = stats["vocabulary"]
+    assert vocab["total_studied"] == 5
+    assert (vocab["mastered"], vocab["known"], vocab["new"], vocab["unseen"]) == (2, 1, 1, 1)
+    assert vocab["for_coverage"] == 3
+    assert vocab["due"] == 1  # only the level 0 word's review has come round
+    assert vocab["stabilized"] == 3
+    assert vocab["new_available"] == 5
+    assert vocab["today_learned"] == 0
+    assert vocab["accuracy"] == 50.0
+    assert list(vocab["mastery_breakdown"]) == ["0", "1", "2", "3", "4"]
+    assert vocab["mastery_breakdown"]["2"] == {"count": 1, "avg_ease": 2.5}
+
+    grammar = stats["grammar"]
+    assert grammar["total_skills"] == 2
+    assert (grammar["skills_mastered"], grammar["skills_proficient"]) == (0, 1)
+    assert grammar["accuracy"] == 82.0
+    assert grammar["weak_skills"] == [{"category": "aorist_active", "name": "Aorist", "accuracy": 50.0}]
+    assert grammar["domains"]["tier_1"]["progress"] == 80.0
+
+
+def test_cached_payload_matches_fresh_computation(client):
+    first = get_stats(client)
+    assert get_stats(client) == first
+    assert fresh_stats(client) == first
+
+
+def test_vocabulary_write_invalidates_cached_payload(client):
+    before = get_stats(client)
+    response = client.post('/api/vocabulary/practice/answer', json={
+        "word_id": 6, "answer": "word 5", "correct_answer": "word 5"
+    })
+    assert response.status_code == 200
+
+    after = get_stats(client)
+    assert after != before
+    assert after["vocabulary"]["total_studied"] == before["vocabulary"]["total_studied"] + 1
+    assert after["vocabulary"]["new_available"] == before["vocabulary"]["new_available"] - 1
+    assert after["vocabulary"]["today_learned"] == 1
+    assert fresh_stats(client) == after
+
+
+def test_skill_write_invalidates_cached_payload(client):
+    before = get_stats(client)
+    response = client.post('/api/skills/record', json={"category": "aorist_active", "correct": True})
+    assert response.status_code == 200
+
+    after = get_stats(client)
+    assert after != before
+    assert after["grammar"]["domains"]["tier_2"]["skills"][0]["attempts"] == 11
+    assert after["grammar"]["weak_skills"][0]["accuracy"] == 54.5
+    assert fresh_stats(client) == after
@@ -1,6 +1,67 @@
-import React, { useState, useEffect, useRef } from 'react';
+import React, { useState, useEffect, useRef, useCallback } from 'react';
 import { textValidationService } from '../services/api';
 
+// Enhanced Greek keyboard layouts, defined once at module scope rather
+// than on every render
+const keyboardLayouts = {
+  basic: [
+    ['α', 'β', 'γ', 'δ', 'ε', 'ζ', 'η', 'θ', 'ι', 'κ'],
+    ['λ', 'μ', 'ν', 'ξ', 'ο', 'π', 'ρ', 'σ', 'τ', 'υ'],
+    ['φ', 'χ', 'ψ', 'ω', 'ς']
+  ],
+  accented: [
+    ['ά', 'έ', 'ή', 'ί', 'ό', 'ύ', 'ώ'],
+    ['ΐ', 'ΰ', 'ϊ', 'ϋ'],
+    ['ἀ', 'ἁ', 'ἐ', 'ἑ', 'ἠ', 'ἡ', 'ἰ', 'ἱ', 'ὀ', 'ὁ'],
+    ['ὐ', 'ὑ', 'ὠ', 'ὡ']
+  ],
+  uppercase: [
+    ['Α', 'Β', 'Γ', 'Δ', 'Ε', 'Ζ', 'Η', 'Θ', 'Ι', 'Κ'],
+    ['Λ', 'Μ', 'Ν', 'Ξ', 'Ο', 'Π', 'Ρ', 'Σ', 'Τ', 'Υ'],
+    ['Φ', 'Χ', 'Ψ', 'Ω']
+  ]
+};
+
+// Common Greek diacritics
+const diacritics = [
+  { name: 'acute', symbol: '́', description: 'Acute accent' },
+  { name: 'grave', symbol: '̀', description: 'Grave accent' },
+  { name: 'circumflex', symbol: '͂', description: 'Circumflex' },
+  { name: 'diaeresis', symbol: '̈', description: 'Diaeresis' },
+  { name: 'rough', symbol: '̔', description: 'Rough breathing' },
+  { name: 'smooth', symbol: '̓', description: 'Smooth breathing' },
+  { name: 'iota_subscript', symbol: 'ͅ', description: 'Iota subscript' }
+];
+
+// Latin -> Greek mapping for the client-side transliteration fallback
+const transliterationMapping = {
+  'th': 'θ', 'ch': 'χ', 'ps': 'ψ', 'au': 'αυ', 'eu': 'ευ', 'ou': 'ου',
+  'ai': 'αι', 'ei': 'ει', 'oi': 'οι', 'ui': 'υι',
+  'a': 'α', 'b': 'β', 'g': 'γ', 'd': 'δ', 'e': 'ε', 'z': 'ζ', 'h': 'η',
+  'i': 'ι', 'k': 'κ', 'l': 'λ', 'm': 'μ', 'n': 'ν', 'x': 'ξ', 'o': 'ο',
+  'p': 'π', 'r': 'ρ', 's': 'σ', 't': 'τ', 'u': 'υ', 'f': 'φ', 'w': 'ω',
+  'y': 'υ', 'v': 'β', 'c': 'κ', 'j': 'ι'
+};
+
+// Sorted by length (longer first) to handle digraphs correctly, with each
+// regex compiled once instead of on every keystroke
+const transliterationRules = Object.entries(transliterationMapping)
+  .sort((a, b) => b[0].length - a[0].length)
+  .map(([latin, greek]) => [new RegExp(latin, 'gi'), greek]);
+
+// Client-side transliteration fallback
+const clientSideTransliterate = (text) => {
+  let result = text;
+  
+  for (const [regex, greek] of transliterationRules) {
+    result = result.replace(regex, (match) => 
+      match === match.toUpperCase() ? greek.toUpperCase() : greek
+    );
+  }
+  
+  return result;
+};
+
 const GreekKeyboard = ({ 
   onTextChange, 
   value = '', 
@@ -29,37 +90,6 @@ const GreekKeyboard = ({
     return () => window.removeEventListener('resize', checkMobile);
   }, []);
 
-  // Enhanced Greek keyboard layouts
-  const keyboardLayouts = {
-    basic: [
-      ['α', 'β', 'γ', 'δ', 'ε', 'ζ', 'η', 'θ', 'ι', 'κ'],
-      ['λ', 'μ', 'ν', 'ξ', 'ο', 'π', 'ρ', 'σ', 'τ', 'υ'],
-      ['φ', 'χ', 'ψ', 'ω', 'ς']
-    ],
-    accented: [
-      ['ά', 'έ', 'ή', 'ί', 'ό', 'ύ', 'ώ'],
-      ['ΐ', 'ΰ', 'ϊ', 'ϋ'],
-      ['ἀ', 'ἁ', 'ἐ', 'ἑ', 'ἠ', 'ἡ', 'ἰ', 'ἱ', 'ὀ', 'ὁ'],
-      ['ὐ', 'ὑ', 'ὠ', 'ὡ']
-    ],
-    uppercase: [
-      ['Α', 'Β', 'Γ', 'Δ', 'Ε', 'Ζ', 'Η', 'Θ', 'Ι', 'Κ'],
-      ['Λ', 'Μ', 'Ν', 'Ξ', 'Ο', 'Π', 'Ρ', 'Σ', 'Τ', 'Υ'],
-      ['Φ', 'Χ', 'Ψ', 'Ω']
-    ]
-  };
-
-  // Common Greek diacritics
-  const diacritics = [
-    { name: 'acute', symbol: '́', description: 'Acute accent' },
-    { name: 'grave', symbol: '̀', description: 'Grave accent' },
-    { name: 'circumflex', symbol: '͂', description: 'Circumflex' },
-    { name: 'diaeresis', symbol: '̈', description: 'Diaeresis' },
-    { name: 'rough', symbol: '̔', description: 'Rough breathing' },
-    { name: 'smooth', symbol: '̓', description: 'Smooth breathing' },
-    { name: 'iota_subscript', symbol: 'ͅ', description: 'Iota subscript' }
-  ];
-
   // Debounced validation
   useEffect(() => {
     if (showValidation && value && correctAnswer) {
@@ -85,7 +115,7 @@ const GreekKeyboard = ({
   }, [value, correctAnswer, showValidation]);
 
   // Handle input changes with real-time transliteration
-  const handleInputChange = async (e) => {
+  const handleInputChange = useCallback(async (e) => {
     const inputText = e.target.value;
     
     if (autoTransliterate && transliterationMode) {
@@ -100,33 +130,7 @@ const GreekKeyboard = ({
     } else {
       onTextChange(inputText);
     }
-  };
-
-  // Client-side transliteration fallback
-  const clientSideTransliterate = (text) => {
-    const mapping = {
-      'th': 'θ', 'ch': 'χ', 'ps': 'ψ', 'au': 'αυ', 'eu': 'ευ', 'ou': 'ου',
-      'ai': 'αι', 'ei': 'ει', 'oi': 'οι', 'ui': 'υι',
-      'a': 'α', 'b': 'β', 'g': 'γ', 'd': 'δ', 'e': 'ε', 'z': 'ζ', 'h': 'η',
-      'i': 'ι', 'k': 'κ', 'l': 'λ', 'm': 'μ', 'n': 'ν', 'x': 'ξ', 'o': 'ο',
-      'p': 'π', 'r': 'ρ', 's': 'σ', 't': 'τ', 'u': 'υ', 'f': 'φ', 'w': 'ω',
-      'y': 'υ', 'v': 'β', 'c': 'κ', 'j': 'ι'
-    };
-
-    let result = text;
-    
-    // Sort by length (longer first) to handle digraphs correctly
-    const sortedMappings = Object.entries(mapping).sort((a, b) => b[0].length - a[0].length);
-    
-    for (const [latin, greek] of sortedMappings) {
-      const regex = new RegExp(latin, 'gi');
-      result = result.replace(regex, (match) => 
-        match === match.toUpperCase() ? greek.toUpperCase() : greek
-      );
-    }
-    
-    return result;
-  };
+  }, [autoTransliterate, transliterationMode, onTextChange]);
 
   // Handle virtual keyboard key press
   const handleVirtualKeyPress = (key) => {
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useCallback, memo } from 'react';
 import { compareGreekTexts } from './GreekKeyboard';
 import { verbsService, textValidationService, skillsService, audioService, API_BASE_URL } from '../services/api';
 import { playChime, playBloop, playClick } from '../services/sound';
@@ -81,6 +81,27 @@ const ConjugationPrompt = ({ tense, mood, voice, number, form }) => {
   );
 };
 
+// Shared starting score. State is only ever replaced, never mutated, so one
+// frozen object can be reused for every reset (and React skips the update
+// when the score is already empty)
+const EMPTY_SCORE = Object.freeze({ correct: 0, total: 0 });
+
+// One multiple-choice answer. Only primitives and a stable callback are
+// passed in, so selecting an option re-renders just the previously and
+// newly selected rows instead of the whole list
+const ChoiceOption = memo(({ option, selected, onSelect }) => (
+  <button
+    onClick={() => onSelect(option)}
+    className={`w-full p-4 text-left rounded-xl border-2 transition-all btn-press ${selected
+        ? 'border-purple-500 bg-purple-500/20 text-white'
+        : 'border-slate-600 bg-slate-700/50 text-slate-200 hover:border-slate-500'
+      }`}
+    style={{ fontFamily: 'Georgia, serif' }}
+  >
+    <span className="text-lg">{option}</span>
+  </button>
+));
+
 const PracticeSession = ({ user, onBackToHome, settings = {} }) => {
   // Extract skill category settings if practicing a specific skill
   const skillCategory = settings?.skillCategory;
@@ -89,7 +110,7 @@ const PracticeSession = ({ user, onBackToHome, settings = {} }) => {
   const [userAnswer, setUserAnswer] = useState('');
   const [showResult, setShowResult] = useState(false);
   const [isCorrect, setIsCorrect] = useState(false);
-  const [score, setScore] = useState({ correct: 0, total: 0 });
+  const [score, setScore] = useState(EMPTY_SCORE);
   const [loading, setLoading] = useState(false);
   const [sessionComplete, setSessionComplete] = useState(false);
   const [conjugations, setConjugations] = useState({});
@@ -132,7 +153,7 @@ const PracticeSession = ({ user, onBackToHome, settings = {} }) => {
       setConjugations(conjugationsMap);
 
       setCurrentQuestionIndex(0);
-      setScore({ correct: 0, total: 0 });
+      setScore(EMPTY_SCORE);
       setSessionComplete(false);
       setPracticeStats(prev => ({
         ...prev,
@@ -149,10 +170,9 @@ const PracticeSession = ({ user, onBackToHome, settings = {} }) => {
 
   // Build stable multiple-choice options for a conjugation
   const buildMultipleChoiceOptions = (verbConjugations, correctForm) => {
-    const otherForms = verbConjugations
-      .map(c => c.form)
-      .filter(f => f && f !== correctForm && f !== '-')
-      .filter((v, i, a) => a.indexOf(v) === i);
+    // A Set dedupes in one pass instead of an indexOf scan per form
+    const otherForms = [...new Set(verbConjugations.map(c => c.form))]
+      .filter(f => f && f !== correctForm && f !== '-');
 
     const shuffled = otherForms.sort(() => Math.random() - 0.5).slice(0, 3);
     return [correctForm, ...shuffled].sort(() => Math.random() - 0.5);
@@ -261,18 +281,9 @@ const PracticeSession = ({ user, onBackToHome, settings = {} }) => {
     const targetConjugation = verbConjugations[Math.floor(Math.random() * verbConjugations.length)];
 
     // Generate multiple choice options if needed
-    let options = null;
-    if (questionType === 'multiple_choice') {
-      const correctAnswer = targetConjugation.form;
-      const otherForms = verbConjugations
-        .map(c => c.form)
-        .filter(f => f && f !== correctAnswer && f !== '-')
-        .filter((v, i, a) => a.indexOf(v) === i); // unique
-
-      // Shuffle and take 3 wrong options
-      const shuffled = otherForms.sort(() => Math.random() - 0.5).slice(0, 3);
-      options = [correctAnswer, ...shuffled].sort(() => Math.random() - 0.5);
-    }
+    const options = questionType === 'multiple_choice'
+      ? buildMultipleChoiceOptions(verbConjugations, targetConjugation.form)
+      : null;
 
     const question = {
       type: questionType,
@@ -293,10 +304,10 @@ const PracticeSession = ({ user, onBackToHome, settings = {} }) => {
   };
 
   // Handle multiple choice selection
-  const handleMultipleChoiceSelect = (option) => {
+  const handleMultipleChoiceSelect = useCallback((option) => {
     setSelectedMultipleChoice(option);
     setUserAnswer(option);
-  };
+  }, []);
 
   // Submit smart practice answer
   const submitSmartAnswer = async () => {
@@ -620,7 +631,7 @@ const PracticeSession = ({ user, onBackToHome, settings = {} }) => {
                   setIsEndlessMode(true);
                   setSessionComplete(false);
                   setCurrentQuestionIndex(0);
-                  setScore({ correct: 0, total: 0 });
+                  setScore(EMPTY_SCORE);
                 }}
                 className="w-full py-3 bg-slate-700 text-white rounded-xl hover:bg-slate-600 transition-colors"
               >
@@ -858,17 +869,12 @@ const PracticeSession = ({ user, onBackToHome, settings = {} }) => {
             {!showResult ? (
               <div className="mb-6 space-y-3">
                 {(smartQuestion?.options || question.options || []).map((option, index) => (
-                  <button
+                  <ChoiceOption
                     key={index}
-                    onClick={() => handleMultipleChoiceSelect(option)}
-                    className={`w-full p-4 text-left rounded-xl border-2 transition-all btn-press ${selectedMultipleChoice === option
-                        ? 'border-purple-500 bg-purple-500/20 text-white'
-                        : 'border-slate-600 bg-slate-700/50 text-slate-200 hover:border-slate-500'
-                      }`}
-                    style={{ fontFamily: 'Georgia, serif' }}
-                  >
-                    <span className="text-lg">{option}</span>
-                  </button>
+                    option={option}
+                    selected={selectedMultipleChoice === option}
+                    onSelect={handleMultipleChoiceSelect}
+                  />
                 ))}
 
                 <button
@@ -2,6 +2,10 @@ import React, { useState, useEffect, useCallback } from 'react';
 import { vocabularyService, audioService, API_BASE_URL } from '../services/api';
 import { playChime, playBloop, playClick } from '../services/sound';
 
+// Shared starting stats; they are only ever replaced, never mutated, so
+// one frozen object serves every reset
+const EMPTY_SESSION_STATS = Object.freeze({ correct: 0, total: 0, streak: 0, maxStreak: 0 });
+
 const VocabularyPractice = ({ user, onBackToHome }) => {
   // Practice state
   const [words, setWords] = useState([]);
@@ -28,7 +32,7 @@ const VocabularyPractice = ({ user, onBackToHome }) => {
   // Stats state
   const [stats, setStats] = useState(null);
   const [statsLoading, setStatsLoading] = useState(true);
-  const [sessionStats, setSessionStats] = useState({ correct: 0, total: 0, streak: 0, maxStreak: 0 });
+  const [sessionStats, setSessionStats] = useState(EMPTY_SESSION_STATS);
   const [categories, setCategories] = useState({ categories: {}, word_types: {} });
   
   // Setup/config view
@@ -90,10 +94,7 @@ const VocabularyPractice = ({ user, onBackToHome }) => {
       setWords(data.words);
       setCurrentIndex(0);
       setSessionStats({ 
-        correct: 0, 
-        total: 0, 
-        streak: 0, 
-        maxStreak: 0,
+        ...EMPTY_SESSION_STATS,
         newCount: data.new_count || 0,
         reviewCount: data.review_count || 0
       });
@@ -135,7 +136,7 @@ const VocabularyPractice = ({ user, onBackToHome }) => {
       
       setWords(data.words);
       setCurrentIndex(0);
-      setSessionStats({ correct: 0, total: 0, streak: 0, maxStreak: 0 });
+      setSessionStats(EMPTY_SESSION_STATS);
       setSessionComplete(false);
       setShowSetup(false);
       
@@ -2,6 +2,15 @@
 import sqlite3
 import json
 from datetime import datetime
+from functools import lru_cache
+
+# Executed once per form; kept as one constant so sqlite3's statement cache
+# reuses the compiled statement instead of re-preparing it
+INSERT_CONJUGATION_SQL = """
+    INSERT OR IGNORE INTO conjugations 
+    (verb_id, tense, mood, voice, person, number, form)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
 
 def map_tense_mood(tense, mood, aspect, greek_pos):
     """Map the morphological dictionary fields to our app's tense/mood schema"""
@@ -35,6 +44,18 @@ def map_person_number(person, number):
     
     return person_map.get(person, "1st"), number_map.get(number, "singular")
 
+@lru_cache(maxsize=None)
+def map_form_tags(tense, mood, aspect, greek_pos, person, number):
+    """Map one form's tags to (tense, mood, voice, person, number).
+
+    There are only a few dozen distinct tag combinations across all
+    forms, so each is mapped once and every later form is a cache hit.
+    """
+    tense, mood = map_tense_mood(tense, mood, aspect, greek_pos)
+    voice = map_voice(greek_pos)
+    person, number = map_person_number(person, number)
+    return tense, mood, voice, person, number
+
 def import_conjugations(json_file):
     """Import conjugations from JSON file into the app database"""
     print("🚀 Importing Morphological Dictionary Conjugations")
@@ -48,7 +69,7 @@ def import_conjugations(json_file):
         print(f"📋 Loaded {len(data)} verbs from JSON file")
         
         # Connect to app database
-        conn = sqlite3.connect('greek-conjugator/backend/greek_conjugator_dev.db')
+        conn = sqlite3.connect('greek-conjugator/backend/greek_conjugator_dev.db', cached_statements=256)
         cursor = conn.cursor()
         
         # Get existing verb IDs for mapping
@@ -82,24 +103,18 @@ def import_conjugations(json_file):
             
             for form_data in finite_forms:
                 # Map fields to our schema
-                tense, mood = map_tense_mood(
+                tense, mood, voice, person, number = map_form_tags(
                     form_data['tense'], 
                     form_data['mood'], 
                     form_data['aspect'], 
-                    form_data['greek_pos']
+                    form_data['greek_pos'],
+                    form_data['person'],
+                    form_data['number']
                 )
-                voice = map_voice(form_data['greek_pos'])
-                
-                # Map person and number
-                person, number = map_person_number(form_data['person'], form_data['number'])
                 
-                # Insert conjugation
+                # Insert conjugation; duplicates are skipped by SQLite
                 try:
-                    cursor.execute("""
-                        INSERT INTO conjugations 
-                        (verb_id, tense, mood, voice, person, number, form)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (
+                    cursor.execute(INSERT_CONJUGATION_SQL, (
                         matching_verb_id,
                         tense,
                         mood,
@@ -108,11 +123,8 @@ def import_conjugations(json_file):
                         number,
                         form_data['form']
                     ))
-                    forms_imported += 1
-                    total_imported += 1
-                except sqlite3.IntegrityError:
-                    # Skip duplicates
-                    pass
+                    forms_imported += cursor.rowcount
+                    total_imported += cursor.rowcount
                 except Exception as e:
                     print(f"❌ Error importing form {form_data['form']} for {lemma}: {e}")
             
@@ -482,6 +482,14 @@ class VocabularyBuilder:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_common_words_tags ON common_words(tags)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_vocab_progress_user ON user_vocabulary_progress(user_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_vocab_progress_review ON user_vocabulary_progress(next_review)")
+        # Holds every column the dashboard aggregates read, so its stats
+        # come from the index alone without touching table rows
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_user_vocab_progress_cover ON user_vocabulary_progress(
+                user_id, mastery_level, ease_factor, interval_days, next_review,
+                last_attempt, created_at, attempts, correct_attempts
+            )
+        """)
         
         conn.commit()
         conn.close()
@@ -0,0 +1,88 @@
+"""
+SQLite Helpers
+==============
+
+Shared connection setup for the analysis and validation scripts, which
+only read from morph_dict.db and the app database.
+"""
+
+import atexit
+import sqlite3
+from functools import lru_cache
+
+# The morphological dictionary never changes while these scripts run, so it
+# is opened immutable: SQLite skips all locking and change detection. Any
+# schema change (e.g. creating indexes) must use a plain sqlite3.connect on
+# MORPH_DICT_PATH instead, and must finish before the immutable connection
+# is opened.
+MORPH_DICT_PATH = 'morph_dict.db'
+MORPH_DICT_URI = f'file:{MORPH_DICT_PATH}?immutable=1'
+
+# Pragmas for read-dominant scripts: relaxed fsyncs, in-memory temp
+# structures, a ~200MB page cache and 256MB of memory-mapped I/O. All are
+# per-connection; the journal mode is persistent and belongs to the writers
+# (the app sets WAL on its own database), so it is never changed here
+READ_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-200000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Lookup indexes the analysis scripts' verb queries rely on
+MORPH_DICT_INDEXES = {
+    'idx_words_word': 'words(word)',
+    'idx_words_lemma_pos_verbform': 'words(lemma, pos, verbform)',
+    'idx_words_pos_lemma': 'words(pos, lemma)',
+}
+
+def ensure_morph_indexes():
+    """Create any missing MORPH_DICT_INDEXES on morph_dict.db, then ANALYZE.
+
+    Once every index exists the file is left untouched, so caches keyed
+    on its mtime stay valid. Call before any immutable connection opens.
+    """
+    try:
+        conn = sqlite3.connect(MORPH_DICT_PATH)
+        try:
+            existing = {name for (name,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )}
+            missing = MORPH_DICT_INDEXES.keys() - existing
+            if missing:
+                for name in missing:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {MORPH_DICT_INDEXES[name]}")
+                conn.execute("ANALYZE")
+                conn.commit()
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"❌ Error creating dictionary indexes: {e}")
+
+def connect_readonly(path, query_only=True, check_same_thread=True):
+    """Open a SQLite connection tuned for a read-heavy workload.
+
+    With query_only (the default) SQLite rejects any write, including to
+    TEMP tables; pass query_only=False for scripts that build temp tables.
+    The connection accepts URI filenames, so MORPH_DICT_URI can be passed
+    directly or ATTACHed. check_same_thread is passed through to sqlite3
+    for connections that are opened in one thread and closed in another.
+    """
+    conn = sqlite3.connect(path, uri=True, check_same_thread=check_same_thread)
+    for pragma in READ_PRAGMAS:
+        conn.execute(pragma)
+    if query_only:
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
+@lru_cache(maxsize=None)
+def shared_connection(path):
+    """Return the process-wide read-only connection to path.
+
+    The first call opens it with connect_readonly; later calls reuse the
+    same handle, so its page cache stays warm between queries. It is
+    closed at interpreter exit, so callers must not close it themselves.
+    """
+    conn = connect_readonly(path)
+    atexit.register(conn.close)
+    return conn